@@ -48,7 +48,7 @@ class AttackPcapGenerator:
             distributions = extract_dataset_distributions(dataset_path)
             sampler = DistributionSampler(self.seed)
             for name, values in distributions.items():
-                if values:
+                if len(values):
                     sampler.add_distribution(name, values)
         else:
             raise ValueError(f"Formato de dataset no soportado: {dataset_path}")
@@ -5,16 +5,22 @@ import unittest
 import tempfile
 import os
 from pathlib import Path
-from scapy.all import rdpcap, IP, TCP, UDP, ICMP, PcapWriter
+from unittest import mock
+import numpy as np
+from scapy.all import rdpcap, wrpcap, Ether, ARP, IP, TCP, UDP, ICMP, Raw, PcapWriter
 
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Los módulos usan imports relativos: se importan como paquete attack_generator
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from attacks import (
+from attack_generator.attacks import (
     SYNFloodGenerator, UDPFloodGenerator, DNSAmplificationGenerator,
     ICMPFloodGenerator, ACKFloodGenerator
 )
-from utils import TimestampGenerator, IPGenerator, RealisticPayloadGenerator
+from attack_generator import utils
+from attack_generator.utils import (
+    TimestampGenerator, IPGenerator, RealisticPayloadGenerator, extract_dataset_distributions
+)
 
 
 class TestTimestampGenerator(unittest.TestCase):
@@ -70,6 +76,55 @@ class TestIPGenerator(unittest.TestCase):
             self.assertFalse(ip.startswith('192.168.'))
             self.assertFalse(ip.startswith('127.'))
 
+    def test_from_subnet_24(self):
+        """/24: mismo prefijo y host entre 1 y 254 (sin red ni broadcast)"""
+        ip_gen = IPGenerator(seed=42)
+
+        for _ in range(500):
+            parts = ip_gen.from_subnet('192.168.1.0/24').split('.')
+            self.assertEqual(parts[:3], ['192', '168', '1'])
+            self.assertTrue(1 <= int(parts[3]) <= 254)
+
+    def test_from_subnet_sin_prefijo_es_24(self):
+        """Sin '/prefijo' se asume /24"""
+        ip_gen = IPGenerator(seed=42)
+
+        for _ in range(100):
+            self.assertTrue(ip_gen.from_subnet('10.20.30.0').startswith('10.20.30.'))
+
+    def test_from_subnet_base_no_alineada(self):
+        """Una dirección base con bits de host se reduce a su red"""
+        ip_gen = IPGenerator(seed=42)
+
+        for _ in range(100):
+            parts = ip_gen.from_subnet('172.16.5.77/24').split('.')
+            self.assertEqual(parts[:3], ['172', '16', '5'])
+            self.assertTrue(1 <= int(parts[3]) <= 254)
+
+    def test_from_subnet_16(self):
+        """/16: host en los dos últimos octetos, sin red ni broadcast"""
+        ip_gen = IPGenerator(seed=42)
+
+        for _ in range(500):
+            a, b, c, d = map(int, ip_gen.from_subnet('10.1.0.0/16').split('.'))
+            self.assertEqual((a, b), (10, 1))
+            self.assertTrue(1 <= (c << 8 | d) <= 65534)
+
+    def test_from_subnet_30(self):
+        """/30: solo los dos hosts utilizables"""
+        ip_gen = IPGenerator(seed=42)
+
+        ips = {ip_gen.from_subnet('192.0.2.4/30') for _ in range(200)}
+        self.assertEqual(ips, {'192.0.2.5', '192.0.2.6'})
+
+    def test_from_subnet_sin_hosts(self):
+        """/31 y /32 no tienen hosts utilizables"""
+        ip_gen = IPGenerator(seed=42)
+
+        for subnet in ('192.0.2.0/31', '192.0.2.1/32'):
+            with self.assertRaises(ValueError):
+                ip_gen.from_subnet(subnet)
+
 
 class TestRealisticPayloadGenerator(unittest.TestCase):
     """Tests para RealisticPayloadGenerator"""
@@ -94,6 +149,113 @@ class TestRealisticPayloadGenerator(unittest.TestCase):
         self.assertIsInstance(dns_query, bytes)
         self.assertGreater(len(dns_query), 0)
 
+    def test_http_post_body(self):
+        """El body del POST tiene el tamaño pedido y solo caracteres [a-z0-9]"""
+        payload_gen = RealisticPayloadGenerator(seed=42)
+
+        for size in (0, 1, 100, 1000):
+            body = payload_gen.http_post(data_size=size).split(b'\r\n\r\n', 1)[1]
+            self.assertEqual(len(body), size)
+            self.assertTrue(set(body) <= set(RealisticPayloadGenerator._ALNUM))
+
+
+class TestJsonIO(unittest.TestCase):
+    """Tests para _load_json/_dump_json (orjson o json de la stdlib)"""
+
+    DATA = {
+        'packet_sizes': np.array([60, 1514, 54], dtype=np.uint16),
+        'inter_arrival_times': np.array([0.5, 1e-6, 0.123456789]),
+        'ttls': np.array([], dtype=np.uint8),
+        'lista': [1, 2, 3],
+    }
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.json_file = os.path.join(self.temp_dir, "dist.json")
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _roundtrip(self):
+        utils._dump_json(self.DATA, self.json_file)
+        loaded = utils._load_json(self.json_file)
+
+        expected = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in self.DATA.items()}
+        self.assertEqual(loaded, expected)
+
+    @unittest.skipIf(utils.orjson is None, "orjson no instalado")
+    def test_roundtrip_orjson(self):
+        """Arrays NumPy se guardan como listas y se leen igual (orjson)"""
+        self._roundtrip()
+
+    def test_roundtrip_json_stdlib(self):
+        """Arrays NumPy se guardan como listas y se leen igual (fallback json)"""
+        with mock.patch.object(utils, 'orjson', None):
+            self._roundtrip()
+
+    def test_distribution_sampler_desde_json(self):
+        """DistributionSampler carga lo que escribe _dump_json"""
+        utils._dump_json(self.DATA, self.json_file)
+        sampler = utils.DistributionSampler(seed=42)
+        sampler.load_from_json(self.json_file)
+
+        for _ in range(20):
+            self.assertIn(sampler.sample('packet_sizes'), [60, 1514, 54])
+
+
+class TestExtractDatasetDistributions(unittest.TestCase):
+    """Tests para extract_dataset_distributions (array estructurado + flags de validez)"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.pcap_file = os.path.join(self.temp_dir, "ref.pcap")
+
+        packets = [
+            Ether() / IP(ttl=64) / TCP(sport=1234, dport=80),
+            Ether() / IP(ttl=128) / UDP(sport=0, dport=5353) / Raw(b'x' * 10),
+            Ether() / ARP(),                 # Sin IP ni puertos
+            Ether() / IP(ttl=0) / ICMP(),    # IP sin puertos; TTL 0 sigue siendo válido
+        ]
+        for pkt, ts in zip(packets, (10.0, 10.5, 10.75, 11.0)):
+            pkt.time = ts
+        self.packets = packets
+        wrpcap(self.pcap_file, packets)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_campos_segun_validez(self):
+        """Cada distribución solo incluye los paquetes donde el campo aplica"""
+        stats = extract_dataset_distributions(self.pcap_file)
+
+        self.assertEqual(stats['packet_sizes'].tolist(), [len(pkt) for pkt in self.packets])
+        # Los flags de validez, no el valor 0, deciden qué entra
+        self.assertEqual(stats['ttls'].tolist(), [64, 128, 0])
+        self.assertEqual(stats['src_ports'].tolist(), [1234, 0])
+        self.assertEqual(stats['dst_ports'].tolist(), [80, 5353])
+        # El primer paquete no tiene inter-arrival
+        np.testing.assert_allclose(stats['inter_arrival_times'], [0.5, 0.25, 0.25])
+
+    def test_devuelve_arrays_numpy(self):
+        """Las distribuciones son arrays NumPy con los tipos del layout"""
+        stats = extract_dataset_distributions(self.pcap_file)
+
+        for values in stats.values():
+            self.assertIsInstance(values, np.ndarray)
+        self.assertEqual(stats['packet_sizes'].dtype, np.uint16)
+        self.assertEqual(stats['ttls'].dtype, np.uint8)
+        self.assertEqual(stats['inter_arrival_times'].dtype, np.float64)
+
+    def test_guardar_json(self):
+        """output_json guarda las mismas distribuciones como listas"""
+        json_file = os.path.join(self.temp_dir, "dist.json")
+        stats = extract_dataset_distributions(self.pcap_file, output_json=json_file)
+
+        loaded = utils._load_json(json_file)
+        self.assertEqual(loaded, {k: v.tolist() for k, v in stats.items()})
+
 
 class TestAttackGenerators(unittest.TestCase):
     """Tests para generadores de ataques"""
@@ -3,6 +3,8 @@ Utilidades para generación realista de paquetes
 """
 import random
 import time
+import socket
+import functools
 import math
 import json
 import numpy as np
@@ -10,6 +12,31 @@ from scapy.all import Raw
 from typing import Dict, List, Tuple
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional: fallback a json de la stdlib
+    orjson = None
+
+
+def _load_json(filepath: str):
+    """Lee un JSON usando orjson si está disponible"""
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def _dump_json(data, filepath: str):
+    """Escribe un JSON indentado; orjson serializa arrays NumPy sin .tolist()"""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        return
+    data = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in data.items()}
+    with open(filepath, 'w') as f:
+        json.dump(data, f, indent=2)
+
 
 class TimestampGenerator:
     """Genera timestamps realistas con variabilidad temporal"""
@@ -73,15 +100,20 @@ class DistributionSampler:
 
     def load_from_json(self, filepath: str):
         """Carga distribuciones desde JSON"""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-            for name, values in data.items():
-                self.add_distribution(name, values)
+        data = _load_json(filepath)
+        for name, values in data.items():
+            self.add_distribution(name, values)
 
 
 class RealisticPayloadGenerator:
     """Genera payloads realistas para diferentes protocolos"""
 
+    _ALNUM = b'abcdefghijklmnopqrstuvwxyz0123456789'
+    _ALNUM_TABLE = (_ALNUM * 8)[:256]  # byte i -> _ALNUM[i % 36]
+    # Bytes >= 252 (7 * 36) se descartan: cada símbolo sale de exactamente
+    # 7 valores de byte, distribución uniforme como random.choices
+    _ALNUM_REJECT = bytes(range(252, 256))
+
     def __init__(self, seed=None):
         self.rng = random.Random(seed)
 
@@ -106,17 +138,27 @@ class RealisticPayloadGenerator:
         )
         return request.encode()
 
+    def _random_alnum(self, size):
+        """size caracteres [a-z0-9] uniformes a partir de bytes aleatorios"""
+        data = b''
+        while len(data) < size:
+            # Bytes mapeados al alfabeto con una tabla de 256 entradas; se
+            # repone lo que haya eliminado el rechazo
+            data += self.rng.randbytes(size - len(data)).translate(
+                self._ALNUM_TABLE, self._ALNUM_REJECT)
+        return data
+
     def http_post(self, data_size=100):
         """Genera request HTTP POST realista"""
-        data = ''.join(self.rng.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=data_size))
+        data = self._random_alnum(data_size)
         request = (
-            f"POST /api/submit HTTP/1.1\r\n"
-            f"Host: example.com\r\n"
-            f"Content-Type: application/x-www-form-urlencoded\r\n"
-            f"Content-Length: {len(data)}\r\n\r\n"
-            f"{data}"
-        )
-        return request.encode()
+            b"POST /api/submit HTTP/1.1\r\n"
+            b"Host: example.com\r\n"
+            b"Content-Type: application/x-www-form-urlencoded\r\n"
+            b"Content-Length: %d\r\n\r\n"
+            b"%s"
+        ) % (len(data), data)
+        return request
 
     def dns_query(self, domains=None):
         """Genera consulta DNS realista"""
@@ -208,20 +250,31 @@ class IPGenerator:
 
     def from_subnet(self, subnet: str):
         """Genera IP dentro de una subnet (ej: 192.168.1.0/24)"""
-        parts = subnet.split('/')
-        base = parts[0].split('.')
-        prefix = int(parts[1]) if len(parts) > 1 else 24
+        base_int, host_bits = _parse_subnet(subnet)
+        host = self.rng.randint(1, (1 << host_bits) - 2)
+        return socket.inet_ntoa((base_int | host).to_bytes(4, 'big'))
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_subnet(subnet: str) -> Tuple[int, int]:
+    """Parsea 'a.b.c.d/prefix' una sola vez -> (red como entero, bits de host)"""
+    addr, _, prefix = subnet.partition('/')
+    host_bits = 32 - (int(prefix) if prefix else 24)
+    base_int = int.from_bytes(socket.inet_aton(addr), 'big')
+    return base_int & ~((1 << host_bits) - 1), host_bits
 
-        # Simple: solo último octeto aleatorio para /24
-        if prefix == 24:
-            return f"{base[0]}.{base[1]}.{base[2]}.{self.rng.randint(1, 254)}"
-        else:
-            # Para otros prefijos, generar según máscara
-            host_bits = 32 - prefix
-            base_int = sum(int(b) << (8 * (3 - i)) for i, b in enumerate(base))
-            host = self.rng.randint(1, (1 << host_bits) - 2)
-            ip_int = base_int + host
-            return '.'.join(str((ip_int >> (8 * (3 - i))) & 0xFF) for i in range(4))
+
+# Layout SoA de extract_dataset_distributions: un registro por paquete.
+# 'valid' marca qué campos aplican (IP, TCP/UDP, inter-arrival).
+_DIST_DTYPE = np.dtype([
+    ('size', 'u2'),
+    ('ttl', 'u1'),
+    ('sport', 'u2'),
+    ('dport', 'u2'),
+    ('iat', 'f8'),
+    ('valid', 'u1'),
+])
+_HAS_IP, _HAS_L4, _HAS_IAT = 1, 2, 4
 
 
 def extract_dataset_distributions(pcap_path: str, output_json: str = None) -> Dict:
@@ -229,49 +282,55 @@ def extract_dataset_distributions(pcap_path: str, output_json: str = None) -> Di
     Extrae distribuciones estadísticas de un PCAP de referencia
 
     Returns:
-        Dict con distribuciones de: packet_sizes, ttls, src_ports, dst_ports, inter_arrival_times
+        Dict con arrays NumPy de: packet_sizes, ttls, src_ports, dst_ports, inter_arrival_times
     """
     from scapy.all import rdpcap, IP, TCP, UDP
 
     print(f"[*] Analizando {pcap_path}...")
     packets = rdpcap(pcap_path)
 
-    stats = {
-        'packet_sizes': [],
-        'ttls': [],
-        'src_ports': [],
-        'dst_ports': [],
-        'inter_arrival_times': []
-    }
+    arr = np.zeros(len(packets), dtype=_DIST_DTYPE)
+    sizes, ttls, sports, dports, iats, valid = (arr[name] for name in _DIST_DTYPE.names)
 
     last_time = None
 
-    for pkt in packets:
+    for i, pkt in enumerate(packets):
         # Tamaños
-        stats['packet_sizes'].append(len(pkt))
+        sizes[i] = len(pkt)
 
         # IP layer
         if IP in pkt:
-            stats['ttls'].append(pkt[IP].ttl)
+            ttls[i] = pkt[IP].ttl
+            valid[i] |= _HAS_IP
 
         # Puertos
-        if TCP in pkt:
-            stats['src_ports'].append(pkt[TCP].sport)
-            stats['dst_ports'].append(pkt[TCP].dport)
-        elif UDP in pkt:
-            stats['src_ports'].append(pkt[UDP].sport)
-            stats['dst_ports'].append(pkt[UDP].dport)
+        l4 = pkt[TCP] if TCP in pkt else pkt[UDP] if UDP in pkt else None
+        if l4 is not None:
+            sports[i] = l4.sport
+            dports[i] = l4.dport
+            valid[i] |= _HAS_L4
 
         # Inter-arrival times
         if hasattr(pkt, 'time'):
             if last_time is not None:
-                stats['inter_arrival_times'].append(float(pkt.time - last_time))
+                iats[i] = float(pkt.time - last_time)
+                valid[i] |= _HAS_IAT
             last_time = pkt.time
 
+    has_ip = (valid & _HAS_IP) != 0
+    has_l4 = (valid & _HAS_L4) != 0
+    has_iat = (valid & _HAS_IAT) != 0
+    stats = {
+        'packet_sizes': np.ascontiguousarray(sizes),
+        'ttls': ttls[has_ip],
+        'src_ports': sports[has_l4],
+        'dst_ports': dports[has_l4],
+        'inter_arrival_times': iats[has_iat],
+    }
+
     # Guardar a JSON si se especifica
     if output_json:
-        with open(output_json, 'w') as f:
-            json.dump(stats, f, indent=2)
+        _dump_json(stats, output_json)
         print(f"[+] Distribuciones guardadas en {output_json}")
 
     print(f"[+] Estadísticas extraídas: {len(packets)} paquetes")
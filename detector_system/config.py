@@ -2,8 +2,9 @@
 Configuración del detector DDoS
 """
 import json
+import functools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 
 class DetectorConfig:
@@ -70,6 +71,16 @@ class DetectorConfig:
         ]
     }
 
+    # Índices de columna precalculados para ML_CONFIG['features']
+    FEATURE_NAMES = tuple(ML_CONFIG['features'])
+    FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def feature_index(feature_names: Tuple[str, ...]) -> Dict[str, int]:
+        """Mapa nombre -> índice de columna, memoizado por lista de columnas"""
+        return {name: i for i, name in enumerate(feature_names)}
+
     @classmethod
     def create_output_dirs(cls):
         """Crea directorios de salida"""
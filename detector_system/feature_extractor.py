@@ -1,6 +1,7 @@
 """
 Extractor de características para detección ML de DDoS
 """
+import io
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -8,6 +9,40 @@ from typing import Dict, List, Optional
 from collections import defaultdict
 import math
 
+try:
+    from .config import DetectorConfig
+except ImportError:  # ejecutado desde scripts/ con el directorio en sys.path
+    from config import DetectorConfig
+
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# Contadores y tasas absolutas: a 100G superan 2**24, que float32 ya no representa exacto
+ML_COUNTER_FEATURES = ('gbps', 'pps', 'unique_src_ips', 'unique_dst_ports',
+                       'syn_per_sec', 'ack_per_sec')
+
+# Tipos explícitos del CSV de features ML: evita la inferencia por columna
+# (float32 solo para ratios, entropías y tamaños)
+ML_FEATURES_DTYPES = {name: 'float64' if name in ML_COUNTER_FEATURES else 'float32'
+                      for name in DetectorConfig.ML_CONFIG['features']}
+ML_FEATURES_DTYPES['timestamp'] = 'float64'
+
+
+def _complete_rows(path: Path) -> io.BytesIO:
+    """
+    Contenido del CSV hasta su último salto de línea
+
+    El detector escribe el log con stdio mientras captura: el buffer puede
+    volcarse a mitad de línea y dejar una fila final incompleta, que se descarta.
+    """
+    data = path.read_bytes()
+    if not data.endswith(b'\n'):
+        data = data[:data.rfind(b'\n') + 1]
+    return io.BytesIO(data)
+
 
 class FeatureExtractor:
     """Extrae features desde logs del detector DPDK"""
@@ -28,7 +63,8 @@ class FeatureExtractor:
         """Carga features ML pre-calculadas"""
         if not self.ml_features_log.exists():
             raise FileNotFoundError(f"Log ML no encontrado: {self.ml_features_log}")
-        df = pd.read_csv(self.ml_features_log)
+        df = pd.read_csv(_complete_rows(self.ml_features_log), engine=CSV_ENGINE,
+                         dtype=ML_FEATURES_DTYPES)
         df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
         return df
 
@@ -67,9 +103,12 @@ class FeatureExtractor:
                            feature_cols: Optional[List[str]] = None) -> np.ndarray:
         """Prepara features para inferencia ML"""
         if feature_cols is None:
-            feature_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            if 'timestamp' in feature_cols:
-                feature_cols.remove('timestamp')
+            if set(DetectorConfig.FEATURE_NAMES).issubset(df.columns):
+                feature_cols = list(DetectorConfig.FEATURE_NAMES)
+            else:
+                feature_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+                if 'timestamp' in feature_cols:
+                    feature_cols.remove('timestamp')
         X = df[feature_cols].values
         X_normalized = (X - X.mean(axis=0)) / (X.std(axis=0) + 1e-8)
         return X_normalized
@@ -8,6 +8,44 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import time
 
+try:
+    from .config import DetectorConfig
+except ImportError:  # ejecutado desde scripts/ con el directorio en sys.path
+    from config import DetectorConfig
+
+try:
+    import joblib
+except ImportError:  # joblib es opcional: fallback a pickle
+    joblib = None
+
+# Formatos nativos de XGBoost (Booster.save_model)
+XGB_NATIVE_SUFFIXES = ('.json', '.ubj')
+
+# Reglas del scoring sin modelo: (columna, umbral, peso), en orden de suma
+RULE_BASED_RULES = (
+    (0, 2.0, 0.3),
+    (1, 2.0, 0.2),
+    (7, 1.5, 0.3),
+    (5, 1.5, 0.25),
+)
+
+
+def _make_rule_scorer(rules):
+    """Especializa el scoring por reglas: umbrales y columnas fijados en el closure"""
+    rules = tuple(rules)
+
+    def scorer(features: np.ndarray) -> np.ndarray:
+        X = np.asarray(features)
+        scores = np.zeros(len(X))
+        if X.ndim != 2:
+            return scores
+        for col, threshold, weight in rules:
+            if col < X.shape[1]:
+                scores += np.where(X[:, col] > threshold, weight, 0.0)
+        return np.minimum(scores, 1.0)
+
+    return scorer
+
 
 class ModelInferencer:
     """Realiza inferencia con modelos ML pre-entrenados"""
@@ -17,6 +55,8 @@ class ModelInferencer:
         self.threshold = threshold
         self.model = None
         self.feature_names = None
+        self._booster = None
+        self._rule_scorer = _make_rule_scorer(RULE_BASED_RULES)
         if self.model_path and self.model_path.exists():
             self.load_model()
 
@@ -27,13 +67,27 @@ class ModelInferencer:
             print(f"[!] Funcionando en modo rule-based")
             return
         print(f"[*] Cargando modelo: {self.model_path}")
-        with open(self.model_path, 'rb') as f:
-            model_data = pickle.load(f)
+        if self.model_path.suffix in XGB_NATIVE_SUFFIXES:
+            import xgboost as xgb
+            self.model = xgb.Booster()
+            self.model.load_model(str(self.model_path))
+            self._booster = self.model
+            print(f"[+] Modelo cargado: {type(self.model).__name__}")
+            return
+        if joblib is not None:
+            # mmap_mode='r' mapea los arrays NumPy del pickle en vez de copiarlos
+            model_data = joblib.load(self.model_path, mmap_mode='r')
+        else:
+            with open(self.model_path, 'rb') as f:
+                model_data = pickle.load(f)
         if isinstance(model_data, dict):
             self.model = model_data.get('model')
             self.feature_names = model_data.get('feature_names')
         else:
             self.model = model_data
+        # Los wrappers sklearn (XGBClassifier) siguen usando su predict_proba, que
+        # respeta best_iteration (early stopping); inplace_predict solo con Booster nativo
+        self._booster = None
         print(f"[+] Modelo cargado: {type(self.model).__name__}")
 
     def predict_proba(self, features: np.ndarray) -> np.ndarray:
@@ -41,7 +95,12 @@ class ModelInferencer:
         if self.model is None:
             return self._rule_based_scoring(features)
         try:
-            if hasattr(self.model, 'predict_proba'):
+            if self._booster is not None:
+                # inplace_predict evita construir un DMatrix en cada llamada
+                X = np.ascontiguousarray(features, dtype=np.float32)
+                proba = self._booster.inplace_predict(X)
+                return proba[:, 1] if proba.ndim > 1 else proba
+            elif hasattr(self.model, 'predict_proba'):
                 proba = self.model.predict_proba(features)
                 return proba[:, 1] if proba.shape[1] > 1 else proba.flatten()
             else:
@@ -52,48 +111,67 @@ class ModelInferencer:
 
     def predict(self, features: np.ndarray) -> np.ndarray:
         """Predice clases binarias (0=normal, 1=ataque)"""
+        _, predictions = self._score_and_classify(features)
+        return predictions
+
+    def _score_and_classify(self, features: np.ndarray):
+        """Calcula probabilidades y clases en una sola pasada del modelo"""
         proba = self.predict_proba(features)
-        return (proba >= self.threshold).astype(int)
+        predictions = (proba >= self.threshold).view(np.int8)
+        return proba, predictions
 
     def _rule_based_scoring(self, features: np.ndarray) -> np.ndarray:
         """Sistema de scoring basado en reglas (fallback sin modelo ML)"""
-        scores = []
-        for sample in features:
-            score = 0.0
-            if len(sample) > 0 and sample[0] > 2.0:
-                score += 0.3
-            if len(sample) > 1 and sample[1] > 2.0:
-                score += 0.2
-            if len(sample) > 7 and sample[7] > 1.5:
-                score += 0.3
-            if len(sample) > 5 and sample[5] > 1.5:
-                score += 0.25
-            scores.append(min(score, 1.0))
-        return np.array(scores)
+        return self._rule_scorer(features)
 
     def detect_attack_type(self, features: np.ndarray,
-                          feature_names: List[str]) -> List[str]:
-        """Clasifica tipo de ataque basándose en features"""
+                          feature_names: Optional[List[str]] = None) -> List[str]:
+        """
+        Clasifica tipo de ataque basándose en features
+
+        Sin feature_names se asume el orden de DetectorConfig.ML_CONFIG['features'].
+        """
+        features = np.asarray(features)
+        n = len(features)
+        no_match = np.zeros(n, dtype=bool)
+
+        # Índices resueltos una sola vez (-1 si la feature no existe)
+        if feature_names is None:
+            feat_idx = DetectorConfig.FEATURE_INDEX
+        else:
+            feat_idx = DetectorConfig.feature_index(tuple(feature_names))
+        syn_i = feat_idx.get('syn_ratio', -1)
+        udp_i = feat_idx.get('udp_ratio', -1)
+        frag_i = feat_idx.get('frag_ratio', -1)
+
+        syn_mask = features[:, syn_i] > 0.7 if syn_i >= 0 else no_match
+        udp_mask = features[:, udp_i] > 0.8 if udp_i >= 0 else no_match
+        frag_mask = features[:, frag_i] > 0.3 if frag_i >= 0 else no_match
+
         attack_types = []
-        feat_idx = {name: i for i, name in enumerate(feature_names)}
-        for sample in features:
+        for syn, udp, frag in zip(syn_mask.tolist(), udp_mask.tolist(), frag_mask.tolist()):
             detected = []
-            if 'syn_ratio' in feat_idx and sample[feat_idx['syn_ratio']] > 0.7:
+            if syn:
                 detected.append('SYN_FLOOD')
-            if 'udp_ratio' in feat_idx and sample[feat_idx['udp_ratio']] > 0.8:
+            if udp:
                 detected.append('UDP_FLOOD')
-            if 'frag_ratio' in feat_idx and sample[feat_idx['frag_ratio']] > 0.3:
+            if frag:
                 detected.append('FRAGMENTATION')
             attack_types.append(detected if detected else ['NORMAL'])
         return attack_types
 
     def real_time_inference(self, features_df: pd.DataFrame,
-                           feature_cols: List[str]) -> Dict:
-        """Inferencia en tiempo real sobre ventana de datos"""
+                           feature_cols: List[str],
+                           as_lists: bool = False) -> Dict:
+        """
+        Inferencia en tiempo real sobre ventana de datos
+
+        'predictions' y 'probabilities' se devuelven como arrays NumPy;
+        con as_lists=True se convierten a listas Python (p.ej. para json).
+        """
         X = features_df[feature_cols].values
         start_time = time.time()
-        proba = self.predict_proba(X)
-        predictions = (proba >= self.threshold).astype(int)
+        proba, predictions = self._score_and_classify(X)
         inference_time = time.time() - start_time
         attack_types = self.detect_attack_type(X, feature_cols)
         results = {
@@ -103,8 +181,11 @@ class ModelInferencer:
             'max_attack_probability': float(proba.max()),
             'mean_attack_probability': float(proba.mean()),
             'inference_time_ms': inference_time * 1000,
-            'predictions': predictions.tolist(),
-            'probabilities': proba.tolist(),
+            'predictions': predictions,
+            'probabilities': proba,
             'attack_types': attack_types,
         }
+        if as_lists:
+            results['predictions'] = predictions.tolist()
+            results['probabilities'] = proba.tolist()
         return results
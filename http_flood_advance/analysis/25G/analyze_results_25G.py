@@ -5,6 +5,8 @@ Advanced analysis of HTTP Flood detector results with baseline, attack, and dete
 """
 
 import re
+import matplotlib
+matplotlib.use('Agg')  # Figures are only written to PNG, no GUI backend
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from datetime import datetime
@@ -13,11 +15,12 @@ import os
 
 
 class HTTPFloodAnalyzer:
-    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100):
+    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100, dpi=150):
         self.log_file = log_file
         self.output_dir = output_dir
         self.snapshots = []
         self.avg_packet_size = avg_packet_size  # bytes
+        self.dpi = dpi  # Resolution of the saved figures
         self.link_capacity_gbps = link_capacity_gbps  # Gbps
 
         # Create output directory if it doesn't exist
@@ -398,7 +401,7 @@ class HTTPFloodAnalyzer:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '01_traffic_overview.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[FIGURE 1: Traffic Overview] - Saved to {output_path}")
@@ -557,7 +560,7 @@ Attack Profile:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '02_detection_efficacy.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[FIGURE 2: Detection Efficacy] - Saved to {output_path}")
@@ -680,7 +683,7 @@ Attack Profile:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '03_baseline_vs_attack.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[FIGURE 3: Baseline vs Attack] - Saved to {output_path}")
@@ -856,7 +859,7 @@ Capacity Status:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '04_link_utilization.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[FIGURE 4: Link Utilization] - Saved to {output_path}")
@@ -4,20 +4,145 @@ HTTP Flood Attack Analysis
 Analiza los resultados del detector HTTP Flood y genera metricas y graficas
 """
 
+import mmap
+import multiprocessing
 import re
+import matplotlib
+matplotlib.use('Agg')  # Solo se generan ficheros PNG, sin backend grafico
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from datetime import datetime
 import numpy as np
 import os
+from typing import NamedTuple
+
+# Cabecera que abre cada bloque de estadisticas del detector. Los patrones son
+# de bytes para operar directamente sobre el log mapeado en memoria (mmap)
+_RE_HEADER = re.compile(rb'HTTP FLOOD DETECTOR - STATISTICS[^\n]*')
+
+# Patron unico del bloque de estadisticas: una alternativa por campo, de modo
+# que la seccion se recorre una sola vez con finditer. El grupo externo de cada
+# alternativa (match.lastgroup) indica que campos extraer segun _FIELD_SPECS.
+# Anclar al inicio de linea evita probar las once alternativas en cada byte
+_RE_FIELDS = re.compile(
+    rb'(?m)^[ \t]*(?:'
+    rb'(?P<total>Total packets:\s+(?P<total_packets>\d+))'
+    rb'|(?P<http>HTTP packets:\s+(?P<http_packets>\d+))'
+    rb'|(?P<baseline>Baseline \(192\.168\):\s+(?P<baseline_packets>\d+)\s+\((?P<baseline_percent>[\d.]+)%\))'
+    rb'|(?P<attack>Attack \(203\.0\.113\):\s+(?P<attack_packets>\d+)\s+\((?P<attack_percent>[\d.]+)%\))'
+    rb'|(?P<unique>Unique IPs:\s+(?P<unique_ips>\d+))'
+    rb'|(?P<heavy>Heavy hitters:\s+(?P<heavy_hitters>\d+))'
+    rb'|(?P<get>GET:\s+(?P<get_count>\d+)\s+\((?P<get_percent>[\d.]+)%\))'
+    rb'|(?P<post>POST:\s+(?P<post_count>\d+)\s+\((?P<post_percent>[\d.]+)%\))'
+    rb'|(?P<top_url>Top URL count:\s+(?P<top_url_count>\d+)\s+\((?P<top_url_percent>[\d.]+)%\))'
+    rb'|(?P<alert>Alert level:\s+(?P<alert_level>\w+))'
+    rb'|(?P<reason>Reason:\s+(?P<alert_reason>.+?)(?:\n|$))'
+    rb')'
+)
+
+
+def _decode(value):
+    return value.decode('utf-8')
+
+
+def _decode_strip(value):
+    return value.decode('utf-8').strip()
+
+
+# int() y float() aceptan bytes directamente; solo el texto se decodifica
+_FIELD_SPECS = {
+    'total': (('total_packets', int),),
+    'http': (('http_packets', int),),
+    'baseline': (('baseline_packets', int), ('baseline_percent', float)),
+    'attack': (('attack_packets', int), ('attack_percent', float)),
+    'unique': (('unique_ips', int),),
+    'heavy': (('heavy_hitters', int),),
+    'get': (('get_count', int), ('get_percent', float)),
+    'post': (('post_count', int), ('post_percent', float)),
+    'top_url': (('top_url_count', int), ('top_url_percent', float)),
+    'alert': (('alert_level', _decode),),
+    'reason': (('alert_reason', _decode_strip),),
+}
+
+# Por encima de estos tamanos se omiten los marcadores por punto y el borde
+# de las barras, cuyo renderizado domina en experimentos largos
+_MAX_MARKER_POINTS = 200
+_MAX_EDGED_BARS = 500
+
+# Minimo de secciones para repartir el parseo entre procesos; por debajo el
+# arranque del pool cuesta mas de lo que ahorra
+_PARALLEL_MIN_SECTIONS = 5000
+
+# Niveles de alerta del detector, en el orden de sus codigos (alert_level_code)
+ALERT_LEVELS = ('NONE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+_ALERT_CODES = {level: code for code, level in enumerate(ALERT_LEVELS)}
+
+
+class Snapshot(NamedTuple):
+    """Estadisticas de un intervalo del detector (campos ausentes a 0)"""
+    index: int
+    interval: int
+    total_packets: int = 0
+    http_packets: int = 0
+    baseline_packets: int = 0
+    baseline_percent: float = 0.0
+    attack_packets: int = 0
+    attack_percent: float = 0.0
+    unique_ips: int = 0
+    heavy_hitters: int = 0
+    get_count: int = 0
+    get_percent: float = 0.0
+    post_count: int = 0
+    post_percent: float = 0.0
+    top_url_count: int = 0
+    top_url_percent: float = 0.0
+    alert_level: str = 'NONE'
+    alert_level_code: int = 0
+    alert_reason: str = 'None'
+
+
+def _parse_snapshot(section, index):
+    """Parse un snapshot individual de estadisticas (seccion en bytes)"""
+    if isinstance(section, str):
+        section = section.encode('utf-8')
+
+    fields = {'index': index, 'interval': (index + 1) * 5}  # 5 segundos por intervalo
+
+    for match in _RE_FIELDS.finditer(section):
+        specs = _FIELD_SPECS[match.lastgroup]
+        if specs[0][0] in fields:
+            continue  # Como con re.search, gana la primera aparicion
+        for key, convert in specs:
+            fields[key] = convert(match.group(key))
+
+    if not fields.get('total_packets'):
+        return None
+
+    # Codigo numerico del nivel (desconocido o ausente cuenta como NONE)
+    fields['alert_level_code'] = _ALERT_CODES.get(fields.get('alert_level'), 0)
+
+    return Snapshot(**fields)
+
+
+def _parse_section_worker(item):
+    """Funcion de modulo (serializable) para multiprocessing.Pool"""
+    index, section = item
+    return _parse_snapshot(section, index)
+
 
 class HTTPFloodAnalyzer:
-    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100):
+    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100, dpi=150, workers=None,
+                 last_snapshots=None):
         self.log_file = log_file
         self.output_dir = output_dir
         self.snapshots = []
         self.avg_packet_size = avg_packet_size  # bytes
         self.link_capacity_gbps = link_capacity_gbps  # Gbps
+        self.dpi = dpi  # Resolucion de las graficas guardadas
+        self.workers = workers  # Procesos para el parseo (None: todos los nucleos)
+        self.last_snapshots = last_snapshots  # Parsear solo las K ultimas secciones (None: todas)
+        self._metrics_cache = None  # Resultado de calculate_metrics
+        self._plot_arrays = None  # Datos derivados compartidos por las graficas
 
         # Crear directorio de salida si no existe
         os.makedirs(output_dir, exist_ok=True)
@@ -35,120 +160,142 @@ class HTTPFloodAnalyzer:
 
     def parse_log(self):
         """Parse el archivo de log y extrae las estadisticas"""
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Buscar todas las secciones de estadisticas
-        stats_sections = re.split(r'╔═+╗\n║\s+HTTP FLOOD DETECTOR - STATISTICS\s+║', content)[1:]
+        with open(self.log_file, 'rb') as f:
+            # mmap no admite ficheros vacios
+            if os.fstat(f.fileno()).st_size == 0:
+                mm = b''
+            else:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            try:
+                # Cada seccion va desde el final de una cabecera hasta la siguiente;
+                # las secciones son independientes y se copian de una en una
+                headers = [(m.start(), m.end()) for m in _RE_HEADER.finditer(mm)]
+                ends = [start for start, _ in headers[1:]] + [len(mm)]
+                # Con last_snapshots se salta el parseo de las secciones anteriores,
+                # conservando el indice global (y por tanto el intervalo)
+                first = max(len(headers) - self.last_snapshots, 0) if self.last_snapshots else 0
+                sections = ((index, mm[headers[index][1]:ends[index]])
+                            for index in range(first, len(headers)))
+
+                workers = self.workers or os.cpu_count() or 1
+                if workers > 1 and len(headers) - first >= _PARALLEL_MIN_SECTIONS:
+                    with multiprocessing.Pool(workers) as pool:
+                        parsed = pool.imap(_parse_section_worker, sections, chunksize=64)
+                        self.snapshots = [s for s in parsed if s]
+                else:
+                    self.snapshots = [s for s in map(_parse_section_worker, sections) if s]
+            finally:
+                if isinstance(mm, mmap.mmap):
+                    mm.close()
+
+        self._build_columns()
+        self._metrics_cache = None
+        self._plot_arrays = None
+
+    def _build_columns(self):
+        """Construye columnas NumPy (SoA) de los snapshots para metricas y graficas"""
+        # Transposicion de la lista de Snapshot: una tupla de valores por campo
+        fields = dict(zip(Snapshot._fields, zip(*self.snapshots)))
+
+        def column(key, dtype):
+            return np.array(fields.get(key, ()), dtype=dtype)
+
+        self.cols = {
+            'interval': column('interval', np.int64),
+            'total_packets': column('total_packets', np.int64),
+            'baseline_packets': column('baseline_packets', np.int64),
+            'attack_packets': column('attack_packets', np.int64),
+            'attack_percent': column('attack_percent', np.float64),
+            'unique_ips': column('unique_ips', np.int64),
+            'heavy_hitters': column('heavy_hitters', np.int64),
+            'get_percent': column('get_percent', np.float64),
+            'post_percent': column('post_percent', np.float64),
+            'top_url_percent': column('top_url_percent', np.float64),
+            'alert_level_code': column('alert_level_code', np.int8),
+            'alert_reason': column('alert_reason', str),
+        }
 
-        for i, section in enumerate(stats_sections):
-            snapshot = self.parse_snapshot(section, i)
-            if snapshot:
-                self.snapshots.append(snapshot)
+    def _ensure_plot_arrays(self):
+        """Calcula una sola vez los datos derivados que usan las graficas"""
+        if self._plot_arrays is not None:
+            return self._plot_arrays
+
+        cols = self.cols
+        attack_percent = cols['attack_percent']
+        # El eje de alertas solo llega a HIGH: CRITICAL se muestra como HIGH
+        alert_numeric = np.minimum(cols['alert_level_code'], 3)
+        reasons = cols['alert_reason']
+        n = len(cols['interval'])
+
+        self._plot_arrays = {
+            'markers': ('o', 's') if n <= _MAX_MARKER_POINTS else (None, None),
+            'bar_edgecolor': 'black' if n <= _MAX_EDGED_BARS else 'none',
+            'attack_colors': np.select([attack_percent == 0, attack_percent < 30], ['green', 'orange'], default='red'),
+            # Tasa incremental: diferencia entre snapshots consecutivos (5 s)
+            'pps_baseline': np.diff(cols['baseline_packets'], prepend=0) / 5.0,
+            'pps_attack': np.diff(cols['attack_packets'], prepend=0) / 5.0,
+            'alert_numeric': alert_numeric,
+            'alert_colors': np.choose(alert_numeric, ['green', 'yellow', 'orange', 'red']),
+            'url_colors': np.where(cols['top_url_percent'] < 80, 'green', 'red'),
+            # Tipos de deteccion por razon
+            'detection_types': {
+                'Heavy Hitters': int((np.char.find(reasons, 'HEAVY HITTERS') >= 0).sum()),
+                'Botnet Pattern': int((np.char.find(reasons, 'BOTNET PATTERN') >= 0).sum()),
+                'High Attack Rate': int((np.char.find(reasons, 'HIGH ATTACK RATE') >= 0).sum()),
+                'None': int((reasons == 'None').sum())
+            },
+        }
+        return self._plot_arrays
 
     def parse_snapshot(self, section, index):
-        """Parse un snapshot individual de estadisticas"""
-        snapshot = {'index': index, 'interval': (index + 1) * 5}  # 5 segundos por intervalo
-
-        # Total packets
-        match = re.search(r'Total packets:\s+(\d+)', section)
-        if match:
-            snapshot['total_packets'] = int(match.group(1))
-
-        # HTTP packets
-        match = re.search(r'HTTP packets:\s+(\d+)', section)
-        if match:
-            snapshot['http_packets'] = int(match.group(1))
-
-        # Baseline packets
-        match = re.search(r'Baseline \(192\.168\):\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['baseline_packets'] = int(match.group(1))
-            snapshot['baseline_percent'] = float(match.group(2))
-
-        # Attack packets
-        match = re.search(r'Attack \(203\.0\.113\):\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['attack_packets'] = int(match.group(1))
-            snapshot['attack_percent'] = float(match.group(2))
-
-        # Unique IPs
-        match = re.search(r'Unique IPs:\s+(\d+)', section)
-        if match:
-            snapshot['unique_ips'] = int(match.group(1))
-
-        # Heavy hitters
-        match = re.search(r'Heavy hitters:\s+(\d+)', section)
-        if match:
-            snapshot['heavy_hitters'] = int(match.group(1))
-
-        # HTTP Methods
-        match = re.search(r'GET:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['get_count'] = int(match.group(1))
-            snapshot['get_percent'] = float(match.group(2))
-
-        match = re.search(r'POST:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['post_count'] = int(match.group(1))
-            snapshot['post_percent'] = float(match.group(2))
-
-        # URL Concentration
-        match = re.search(r'Top URL count:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['top_url_count'] = int(match.group(1))
-            snapshot['top_url_percent'] = float(match.group(2))
-
-        # Alert level
-        match = re.search(r'Alert level:\s+(\w+)', section)
-        if match:
-            snapshot['alert_level'] = match.group(1)
-
-        # Alert reason
-        match = re.search(r'Reason:\s+(.+?)(?:\n|$)', section)
-        if match:
-            snapshot['alert_reason'] = match.group(1).strip()
-        else:
-            snapshot['alert_reason'] = 'None'
-
-        return snapshot if snapshot.get('total_packets') else None
+        """Parse un snapshot individual de estadisticas (seccion en bytes)"""
+        return _parse_snapshot(section, index)
 
     def calculate_metrics(self):
-        """Calcula metricas generales del experimento"""
+        """Calcula metricas generales del experimento (cacheadas tras la primera llamada)"""
+        if self._metrics_cache is not None:
+            return self._metrics_cache
+
         if not self.snapshots:
             return {}
 
-        # Fase de baseline (antes del ataque)
-        baseline_phase = [s for s in self.snapshots if s.get('attack_percent', 0) == 0]
+        cols = self.cols
+        interval = cols['interval']
+        total = cols['total_packets']
+        codes = cols['alert_level_code']
 
-        # Fase de ataque
-        attack_phase = [s for s in self.snapshots if s.get('attack_percent', 0) > 0]
+        # Fase de baseline (antes del ataque) y fase de ataque como mascaras
+        baseline_mask = cols['attack_percent'] == 0
+        attack_mask = cols['attack_percent'] > 0
+        baseline_idx = np.flatnonzero(baseline_mask)
+        attack_idx = np.flatnonzero(attack_mask)
 
         metrics = {
             'total_snapshots': len(self.snapshots),
-            'baseline_snapshots': len(baseline_phase),
-            'attack_snapshots': len(attack_phase),
+            'baseline_snapshots': len(baseline_idx),
+            'attack_snapshots': len(attack_idx),
         }
 
-        if baseline_phase:
-            last_baseline = baseline_phase[-1]
-            metrics['baseline_total_packets'] = last_baseline['total_packets']
-            metrics['baseline_avg_pps'] = last_baseline['total_packets'] / last_baseline['interval']
-            metrics['baseline_unique_ips'] = last_baseline['unique_ips']
+        if len(baseline_idx):
+            last_baseline = baseline_idx[-1]
+            metrics['baseline_total_packets'] = int(total[last_baseline])
+            metrics['baseline_avg_pps'] = int(total[last_baseline]) / int(interval[last_baseline])
+            metrics['baseline_unique_ips'] = int(cols['unique_ips'][last_baseline])
 
             # Calcular Gbps y utilizacion del enlace para baseline
             metrics['baseline_gbps'] = self.pps_to_gbps(metrics['baseline_avg_pps'])
             metrics['baseline_link_utilization'] = self.calculate_link_utilization(metrics['baseline_gbps'])
 
-        if attack_phase:
-            first_attack = attack_phase[0]
-            last_attack = attack_phase[-1]
+        if len(attack_idx):
+            first_attack = attack_idx[0]
+            last_attack = attack_idx[-1]
 
             # Paquetes de ataque
-            total_attack_packets = last_attack.get('attack_packets', 0)
-            attack_duration = last_attack['interval'] - first_attack['interval'] + 5
+            total_attack_packets = int(cols['attack_packets'][last_attack])
+            attack_duration = int(interval[last_attack] - interval[first_attack]) + 5
 
-            metrics['attack_start_time'] = first_attack['interval']
+            metrics['attack_start_time'] = int(interval[first_attack])
             metrics['attack_duration'] = attack_duration
             metrics['total_attack_packets'] = total_attack_packets
             metrics['attack_avg_pps'] = total_attack_packets / attack_duration if attack_duration > 0 else 0
@@ -158,40 +305,37 @@ class HTTPFloodAnalyzer:
             metrics['attack_link_utilization'] = self.calculate_link_utilization(metrics['attack_gbps'])
 
             # Calcular total durante ataque (baseline + attack)
-            # Obtener PPS total promedio durante fase de ataque
-            total_pps_during_attack = []
-            for i, s in enumerate(attack_phase):
-                if i == 0:
-                    prev_total = baseline_phase[-1]['total_packets'] if baseline_phase else 0
-                else:
-                    prev_total = attack_phase[i-1]['total_packets']
-                pps = (s['total_packets'] - prev_total) / 5
-                total_pps_during_attack.append(pps)
+            # PPS total de cada snapshot de ataque respecto al snapshot de ataque
+            # anterior; el primero se compara con el ultimo snapshot de baseline
+            prev_total = total[baseline_idx[-1]] if len(baseline_idx) else 0
+            total_pps_during_attack = np.diff(total[attack_idx], prepend=prev_total) / 5
 
-            metrics['total_avg_pps_during_attack'] = np.mean(total_pps_during_attack) if total_pps_during_attack else 0
+            metrics['total_avg_pps_during_attack'] = float(total_pps_during_attack.mean())
             metrics['total_gbps_during_attack'] = self.pps_to_gbps(metrics['total_avg_pps_during_attack'])
             metrics['total_link_utilization_during_attack'] = self.calculate_link_utilization(metrics['total_gbps_during_attack'])
 
             # Porcentaje maximo de ataque
-            metrics['max_attack_percent'] = max(s.get('attack_percent', 0) for s in attack_phase)
+            metrics['max_attack_percent'] = float(cols['attack_percent'][attack_idx].max())
 
             # Tiempo hasta primera deteccion
-            first_detection = next((s for s in self.snapshots if s.get('alert_level') != 'NONE'), None)
-            if first_detection:
-                metrics['time_to_detection'] = first_detection['interval']
-                metrics['detection_alert_level'] = first_detection['alert_level']
+            detected = np.flatnonzero(codes)
+            if len(detected):
+                first_detection = detected[0]
+                metrics['time_to_detection'] = int(interval[first_detection])
+                metrics['detection_alert_level'] = ALERT_LEVELS[codes[first_detection]]
 
             # Alertas generadas
-            alert_counts = {'NONE': 0, 'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
-            for s in self.snapshots:
-                level = s.get('alert_level', 'NONE')
-                alert_counts[level] = alert_counts.get(level, 0) + 1
+            counts = np.bincount(codes, minlength=len(ALERT_LEVELS))
+            alert_counts = {level: int(n) for level, n in zip(ALERT_LEVELS[:4], counts)}
+            if counts[4]:
+                alert_counts['CRITICAL'] = int(counts[4])
 
             metrics['alert_counts'] = alert_counts
 
             # Heavy hitters maximos
-            metrics['max_heavy_hitters'] = max(s.get('heavy_hitters', 0) for s in self.snapshots)
+            metrics['max_heavy_hitters'] = int(cols['heavy_hitters'].max())
 
+        self._metrics_cache = metrics
         return metrics
 
     def print_metrics(self):
@@ -241,7 +385,7 @@ class HTTPFloodAnalyzer:
 
             # Falsos positivos (alertas durante baseline)
             baseline_alerts = sum(1 for s in self.snapshots[:metrics.get('baseline_snapshots', 0)]
-                                 if s.get('alert_level', 'NONE') != 'NONE')
+                                 if s.alert_level != 'NONE')
             print(f"  Falsos positivos (baseline):  {baseline_alerts}")
 
             # Precision
@@ -262,12 +406,16 @@ class HTTPFloodAnalyzer:
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Analisis de Trafico HTTP Flood', fontsize=16, fontweight='bold')
 
-        # Datos para los graficos
-        intervals = [s['interval'] for s in self.snapshots]
-        total_packets = [s['total_packets'] for s in self.snapshots]
-        baseline_packets = [s.get('baseline_packets', 0) for s in self.snapshots]
-        attack_packets = [s.get('attack_packets', 0) for s in self.snapshots]
-        attack_percent = [s.get('attack_percent', 0) for s in self.snapshots]
+        # Datos para los graficos (vistas de las columnas, sin copias)
+        cols = self.cols
+        derived = self._ensure_plot_arrays()
+        marker_o, marker_s = derived['markers']
+        bar_edgecolor = derived['bar_edgecolor']
+        intervals = cols['interval']
+        total_packets = cols['total_packets']
+        baseline_packets = cols['baseline_packets']
+        attack_packets = cols['attack_packets']
+        attack_percent = cols['attack_percent']
 
         # 1. Paquetes acumulados (baseline vs ataque)
         ax1 = axes[0, 0]
@@ -283,8 +431,7 @@ class HTTPFloodAnalyzer:
 
         # 2. Porcentaje de trafico de ataque
         ax2 = axes[0, 1]
-        colors = ['green' if p == 0 else 'orange' if p < 30 else 'red' for p in attack_percent]
-        ax2.bar(intervals, attack_percent, width=4, color=colors, alpha=0.7, edgecolor='black')
+        ax2.bar(intervals, attack_percent, width=4, color=derived['attack_colors'], alpha=0.7, edgecolor=bar_edgecolor)
         ax2.axhline(y=30, color='red', linestyle='--', linewidth=2, label='Umbral critico (30%)')
         ax2.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax2.set_ylabel('% Trafico de Ataque', fontsize=12)
@@ -295,18 +442,8 @@ class HTTPFloodAnalyzer:
 
         # 3. Tasa de paquetes por segundo (incremental)
         ax3 = axes[1, 0]
-        pps_baseline = []
-        pps_attack = []
-        for i in range(len(self.snapshots)):
-            if i == 0:
-                pps_baseline.append(baseline_packets[i] / 5)
-                pps_attack.append(attack_packets[i] / 5)
-            else:
-                pps_baseline.append((baseline_packets[i] - baseline_packets[i-1]) / 5)
-                pps_attack.append((attack_packets[i] - attack_packets[i-1]) / 5)
-
-        ax3.plot(intervals, pps_baseline, 'g-', linewidth=2, marker='o', markersize=4, label='Baseline PPS')
-        ax3.plot(intervals, pps_attack, 'r-', linewidth=2, marker='s', markersize=4, label='Ataque PPS')
+        ax3.plot(intervals, derived['pps_baseline'], 'g-', linewidth=2, marker=marker_o, markersize=4, label='Baseline PPS')
+        ax3.plot(intervals, derived['pps_attack'], 'r-', linewidth=2, marker=marker_s, markersize=4, label='Ataque PPS')
         ax3.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax3.set_ylabel('Paquetes por Segundo (PPS)', fontsize=12)
         ax3.set_title('Tasa de Trafico Incremental', fontsize=14, fontweight='bold')
@@ -316,22 +453,7 @@ class HTTPFloodAnalyzer:
 
         # 4. Niveles de alerta
         ax4 = axes[1, 1]
-        alert_levels = [s.get('alert_level', 'NONE') for s in self.snapshots]
-        alert_numeric = []
-        for level in alert_levels:
-            if level == 'NONE':
-                alert_numeric.append(0)
-            elif level == 'LOW':
-                alert_numeric.append(1)
-            elif level == 'MEDIUM':
-                alert_numeric.append(2)
-            elif level == 'HIGH':
-                alert_numeric.append(3)
-            else:
-                alert_numeric.append(0)
-
-        colors_alert = ['green' if a == 0 else 'yellow' if a == 1 else 'orange' if a == 2 else 'red' for a in alert_numeric]
-        ax4.bar(intervals, alert_numeric, width=4, color=colors_alert, alpha=0.7, edgecolor='black')
+        ax4.bar(intervals, derived['alert_numeric'], width=4, color=derived['alert_colors'], alpha=0.7, edgecolor=bar_edgecolor)
         ax4.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax4.set_ylabel('Nivel de Alerta', fontsize=12)
         ax4.set_title('Estado de Alertas del Sistema Detector', fontsize=14, fontweight='bold')
@@ -350,7 +472,7 @@ class HTTPFloodAnalyzer:
 
         # Guardar grafica
         output_path = os.path.join(self.output_dir, '01_traffic_analysis.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[GRAFICA 1: Analisis de Trafico] - Guardada en {output_path}")
@@ -364,16 +486,20 @@ class HTTPFloodAnalyzer:
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Metricas de Deteccion HTTP Flood', fontsize=16, fontweight='bold')
 
-        intervals = [s['interval'] for s in self.snapshots]
+        cols = self.cols
+        derived = self._ensure_plot_arrays()
+        marker_o, marker_s = derived['markers']
+        bar_edgecolor = derived['bar_edgecolor']
+        intervals = cols['interval']
 
         # 1. IPs unicas y Heavy Hitters
         ax1 = axes[0, 0]
-        unique_ips = [s.get('unique_ips', 0) for s in self.snapshots]
-        heavy_hitters = [s.get('heavy_hitters', 0) for s in self.snapshots]
+        unique_ips = cols['unique_ips']
+        heavy_hitters = cols['heavy_hitters']
 
         ax1_twin = ax1.twinx()
-        line1 = ax1.plot(intervals, unique_ips, 'b-', linewidth=2, marker='o', markersize=4, label='IPs Unicas')
-        line2 = ax1_twin.plot(intervals, heavy_hitters, 'r-', linewidth=2, marker='s', markersize=4, label='Heavy Hitters')
+        line1 = ax1.plot(intervals, unique_ips, 'b-', linewidth=2, marker=marker_o, markersize=4, label='IPs Unicas')
+        line2 = ax1_twin.plot(intervals, heavy_hitters, 'r-', linewidth=2, marker=marker_s, markersize=4, label='Heavy Hitters')
 
         ax1.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax1.set_ylabel('IPs Unicas', fontsize=12, color='b')
@@ -390,11 +516,11 @@ class HTTPFloodAnalyzer:
 
         # 2. Distribucion de metodos HTTP
         ax2 = axes[0, 1]
-        get_percent = [s.get('get_percent', 0) for s in self.snapshots]
-        post_percent = [s.get('post_percent', 0) for s in self.snapshots]
+        get_percent = cols['get_percent']
+        post_percent = cols['post_percent']
 
-        ax2.plot(intervals, get_percent, 'g-', linewidth=2, marker='o', markersize=4, label='GET %')
-        ax2.plot(intervals, post_percent, 'b-', linewidth=2, marker='s', markersize=4, label='POST %')
+        ax2.plot(intervals, get_percent, 'g-', linewidth=2, marker=marker_o, markersize=4, label='GET %')
+        ax2.plot(intervals, post_percent, 'b-', linewidth=2, marker=marker_s, markersize=4, label='POST %')
         ax2.axhline(y=98, color='red', linestyle='--', linewidth=2, label='Umbral anomalia GET (98%)')
         ax2.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax2.set_ylabel('Porcentaje (%)', fontsize=12)
@@ -405,10 +531,9 @@ class HTTPFloodAnalyzer:
 
         # 3. Concentracion de URLs
         ax3 = axes[1, 0]
-        top_url_percent = [s.get('top_url_percent', 0) for s in self.snapshots]
+        top_url_percent = cols['top_url_percent']
 
-        colors = ['green' if p < 80 else 'red' for p in top_url_percent]
-        ax3.bar(intervals, top_url_percent, width=4, color=colors, alpha=0.7, edgecolor='black')
+        ax3.bar(intervals, top_url_percent, width=4, color=derived['url_colors'], alpha=0.7, edgecolor=bar_edgecolor)
         ax3.axhline(y=80, color='red', linestyle='--', linewidth=2, label='Umbral anomalia (80%)')
         ax3.set_xlabel('Tiempo (segundos)', fontsize=12)
         ax3.set_ylabel('% URL mas frecuente', fontsize=12)
@@ -420,23 +545,7 @@ class HTTPFloodAnalyzer:
         ax4 = axes[1, 1]
 
         # Contar tipos de deteccion por razon
-        detection_types = {
-            'Heavy Hitters': 0,
-            'Botnet Pattern': 0,
-            'High Attack Rate': 0,
-            'None': 0
-        }
-
-        for s in self.snapshots:
-            reason = s.get('alert_reason', 'None')
-            if 'HEAVY HITTERS' in reason:
-                detection_types['Heavy Hitters'] += 1
-            if 'BOTNET PATTERN' in reason:
-                detection_types['Botnet Pattern'] += 1
-            if 'HIGH ATTACK RATE' in reason:
-                detection_types['High Attack Rate'] += 1
-            if reason == 'None':
-                detection_types['None'] += 1
+        detection_types = derived['detection_types']
 
         labels = list(detection_types.keys())
         sizes = list(detection_types.values())
@@ -451,7 +560,7 @@ class HTTPFloodAnalyzer:
 
         # Guardar grafica
         output_path = os.path.join(self.output_dir, '02_detection_metrics.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[GRAFICA 2: Metricas de Deteccion] - Guardada en {output_path}")
@@ -521,7 +630,7 @@ class HTTPFloodAnalyzer:
 
         # Guardar grafica
         output_path = os.path.join(self.output_dir, '03_attack_effectiveness.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi)
         plt.close()
 
         print(f"\n[GRAFICA 3: Efectividad del Ataque] - Guardada en {output_path}")
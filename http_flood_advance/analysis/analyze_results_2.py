@@ -4,21 +4,110 @@ HTTP Flood Attack Analysis v2
 Advanced analysis of HTTP Flood detector results with baseline, attack, and detection efficacy metrics
 """
 
-import re
+import matplotlib
+matplotlib.use('Agg')  # Figures are only written to PNG, no GUI backend
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import numpy as np
+import mmap
+import operator
 import os
 
 
+def _parse_count(value):
+    """'1234' -> (1234,)"""
+    return (int(value),)
+
+
+def _parse_count_percent(value):
+    """'1234 (56.7%)' -> (1234, 56.7)"""
+    count, percent = value.split(None, 1)
+    return int(count), float(percent.strip('(%)'))
+
+
+def _parse_word(value):
+    """First word of the value, e.g. the alert level"""
+    return (value.split(None, 1)[0],)
+
+
+def _parse_text(value):
+    """Whole value as text, e.g. the alert reason"""
+    return (value,)
+
+
 class HTTPFloodAnalyzer:
-    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100):
+    # Title line that opens every statistics section of the detector log
+    _HEADER_TITLE = 'HTTP FLOOD DETECTOR - STATISTICS'
+
+    # Line-oriented field dispatcher: every field sits on its own line as
+    # "<prefix>: <value>", so the prefix before the first ':' selects the
+    # snapshot keys and the parser for the value (no regex involved)
+    _FIELD_HANDLERS = {
+        'Total packets': (('total_packets',), _parse_count),
+        'HTTP packets': (('http_packets',), _parse_count),
+        'Baseline (192.168)': (('baseline_packets', 'baseline_percent'), _parse_count_percent),
+        'Attack (203.0.113)': (('attack_packets', 'attack_percent'), _parse_count_percent),
+        'Unique IPs': (('unique_ips',), _parse_count),
+        'Heavy hitters': (('heavy_hitters',), _parse_count),
+        'GET': (('get_count', 'get_percent'), _parse_count_percent),
+        'POST': (('post_count', 'post_percent'), _parse_count_percent),
+        'Top URL count': (('top_url_count', 'top_url_percent'), _parse_count_percent),
+        'Alert level': (('alert_level',), _parse_word),
+        'Reason': (('alert_reason',), _parse_text),
+    }
+
+    # Above this many snapshots the time-series plots are downsampled and bar
+    # series are drawn as filled steps instead of one Rectangle per bar
+    _MAX_PLOT_POINTS = 2000
+
+    # Fast deflate for the PNGs: encoding gets cheaper, files ~25% larger
+    _PNG_OPTIONS = {'compress_level': 1}
+
+    # Bar colour palettes, indexed by severity (0 = normal)
+    _SEVERITY_COLORS = np.array(['green', 'orange', 'red'])
+    _ALERT_COLORS = np.array(['green', 'yellow', 'orange', 'red'])  # By alert code up to HIGH
+
+    # Below this many sections, worker start-up costs more than it saves
+    _PARALLEL_MIN_SECTIONS = 5000
+
+    # Detector alert levels, indexed by their numeric code
+    ALERT_LEVELS = ('NONE', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL')
+    _ALERT_CODES = {level: code for code, level in enumerate(ALERT_LEVELS)}
+
+    # One record per snapshot: self.snapshots is a structured array, so each
+    # field is a contiguous-stride column (self.snapshots['attack_percent'])
+    SNAPSHOT_DTYPE = np.dtype([
+        ('index', 'i4'), ('interval', 'i4'),
+        ('total_packets', 'i8'), ('http_packets', 'i8'),
+        ('baseline_packets', 'i8'), ('baseline_percent', 'f8'),
+        ('attack_packets', 'i8'), ('attack_percent', 'f8'),
+        ('unique_ips', 'i8'), ('heavy_hitters', 'i8'),
+        ('get_count', 'i8'), ('get_percent', 'f8'),
+        ('post_count', 'i8'), ('post_percent', 'f8'),
+        ('top_url_count', 'i8'), ('top_url_percent', 'f8'),
+        ('alert_code', 'i1'), ('alert_reason', 'O'),
+    ])
+    # Values for the fields a section leaves out, and a getter that lays a
+    # complete snapshot dict out in SNAPSHOT_DTYPE order
+    _RECORD_DEFAULTS = dict.fromkeys(SNAPSHOT_DTYPE.names, 0)
+    _record_fields = operator.itemgetter(*SNAPSHOT_DTYPE.names)
+
+    def __init__(self, log_file, output_dir, avg_packet_size=700, link_capacity_gbps=100, dpi=150, workers=None):
         self.log_file = log_file
         self.output_dir = output_dir
-        self.snapshots = []
+        self.snapshots = np.empty(0, dtype=self.SNAPSHOT_DTYPE)
         self.avg_packet_size = avg_packet_size  # bytes
         self.link_capacity_gbps = link_capacity_gbps  # Gbps
+        self.dpi = dpi  # Resolution of the saved figures
+        self.workers = workers  # Parser processes (None: one per CPU)
+        self._metrics = None  # Cached calculate_metrics() result
+        # Phase masks over self.snapshots, shared by metrics and plots
+        self._baseline_mask = np.empty(0, dtype=bool)
+        self._attack_mask = np.empty(0, dtype=bool)
+        # Contiguous copy of the interval column, the x axis of every plot
+        self._intervals = np.empty(0, dtype=np.int32)
 
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
@@ -36,122 +125,142 @@ class HTTPFloodAnalyzer:
 
     def parse_log(self):
         """Parse log file and extract statistics"""
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find all statistics sections
-        stats_sections = re.split(r'╔═+╗\n║\s+HTTP FLOOD DETECTOR - STATISTICS\s+║', content)[1:]
-
-        for i, section in enumerate(stats_sections):
-            snapshot = self.parse_snapshot(section, i)
-            if snapshot:
-                self.snapshots.append(snapshot)
+        with open(self.log_file, 'rb') as f:
+            # mmap cannot map an empty file
+            if os.fstat(f.fileno()).st_size == 0:
+                mm = b''
+            else:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            try:
+                # Walk the header lines with find(); a section spans from the end
+                # of its header line to the start of the next header line
+                title = self._HEADER_TITLE.encode()
+                spans = []
+                pos = mm.find(title)
+                while pos != -1:
+                    start = mm.find(b'\n', pos)
+                    start = len(mm) if start == -1 else start + 1
+                    pos = mm.find(title, start)
+                    end = len(mm) if pos == -1 else mm.rfind(b'\n', start, pos) + 1
+                    spans.append((start, max(end, start)))
+
+                # Sections are independent; only one is copied out of the
+                # mapping at a time (or per worker chunk)
+                sections = ((index, mm[start:end]) for index, (start, end) in enumerate(spans))
+
+                workers = self.workers or os.cpu_count() or 1
+                if workers > 1 and len(spans) >= self._PARALLEL_MIN_SECTIONS:
+                    with ProcessPoolExecutor(workers) as executor:
+                        rows = [r for r in executor.map(self._parse_section, sections, chunksize=64) if r]
+                else:
+                    rows = [r for r in map(self._parse_section, sections) if r]
+            finally:
+                if isinstance(mm, mmap.mmap):
+                    mm.close()
+
+        self.snapshots = np.array(rows, dtype=self.SNAPSHOT_DTYPE) if rows else np.empty(0, dtype=self.SNAPSHOT_DTYPE)
+        self._baseline_mask = self.snapshots['attack_percent'] == 0
+        self._attack_mask = self.snapshots['attack_percent'] > 0
+        # Not np.arange: sections without traffic are skipped but keep their index
+        self._intervals = np.ascontiguousarray(self.snapshots['interval'])
+        self._metrics = None
+
+    @classmethod
+    def _parse_section(cls, item):
+        """Parse one (index, section bytes) pair into a snapshot record tuple
+
+        A classmethod so that ProcessPoolExecutor can pickle it by reference;
+        workers send back plain tuples instead of dicts.
+        """
+        index, section = item
+        snapshot = cls._parse_lines(section.decode('utf-8').splitlines(), index)
+        if snapshot is None:
+            return None
+        return cls._record_fields({**cls._RECORD_DEFAULTS, **snapshot})
 
     def parse_snapshot(self, section, index):
         """Parse individual snapshot of statistics"""
+        return self._parse_lines(section.splitlines(), index)
+
+    @classmethod
+    def _parse_lines(cls, lines, index):
+        """Parse the lines of one statistics section into a snapshot"""
         snapshot = {'index': index, 'interval': (index + 1) * 5}  # 5 seconds per interval
 
-        # Total packets
-        match = re.search(r'Total packets:\s+(\d+)', section)
-        if match:
-            snapshot['total_packets'] = int(match.group(1))
-
-        # HTTP packets
-        match = re.search(r'HTTP packets:\s+(\d+)', section)
-        if match:
-            snapshot['http_packets'] = int(match.group(1))
-
-        # Baseline packets
-        match = re.search(r'Baseline \(192\.168\):\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['baseline_packets'] = int(match.group(1))
-            snapshot['baseline_percent'] = float(match.group(2))
-
-        # Attack packets
-        match = re.search(r'Attack \(203\.0\.113\):\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['attack_packets'] = int(match.group(1))
-            snapshot['attack_percent'] = float(match.group(2))
-
-        # Unique IPs
-        match = re.search(r'Unique IPs:\s+(\d+)', section)
-        if match:
-            snapshot['unique_ips'] = int(match.group(1))
-
-        # Heavy hitters
-        match = re.search(r'Heavy hitters:\s+(\d+)', section)
-        if match:
-            snapshot['heavy_hitters'] = int(match.group(1))
-
-        # HTTP Methods
-        match = re.search(r'GET:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['get_count'] = int(match.group(1))
-            snapshot['get_percent'] = float(match.group(2))
-
-        match = re.search(r'POST:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['post_count'] = int(match.group(1))
-            snapshot['post_percent'] = float(match.group(2))
-
-        # URL Concentration
-        match = re.search(r'Top URL count:\s+(\d+)\s+\(([\d.]+)%\)', section)
-        if match:
-            snapshot['top_url_count'] = int(match.group(1))
-            snapshot['top_url_percent'] = float(match.group(2))
-
-        # Alert level
-        match = re.search(r'Alert level:\s+(\w+)', section)
-        if match:
-            snapshot['alert_level'] = match.group(1)
+        for line in lines:
+            key, sep, value = line.strip().partition(':')
+            handler = cls._FIELD_HANDLERS.get(key) if sep else None
+            if handler is None:
+                continue
+            keys, parse = handler
+            value = value.strip()
+            if keys[0] in snapshot or not value:
+                continue  # First occurrence wins
+            try:
+                snapshot.update(zip(keys, parse(value)))
+            except ValueError:
+                continue  # Malformed value, the field is left out
+
+        # Integer alert code (a missing or unknown level counts as NONE)
+        snapshot['alert_code'] = cls._ALERT_CODES.get(snapshot.get('alert_level'), 0)
 
         # Alert reason
-        match = re.search(r'Reason:\s+(.+?)(?:\n|$)', section)
-        if match:
-            snapshot['alert_reason'] = match.group(1).strip()
-        else:
-            snapshot['alert_reason'] = 'None'
+        snapshot.setdefault('alert_reason', 'None')
 
         return snapshot if snapshot.get('total_packets') else None
 
     def calculate_metrics(self):
-        """Calculate comprehensive experiment metrics"""
-        if not self.snapshots:
+        """Calculate comprehensive experiment metrics (computed once, then cached)"""
+        if self._metrics is None:
+            self._metrics = self._compute_metrics()
+        return self._metrics
+
+    def _compute_metrics(self):
+        """Compute the metrics from the parsed snapshots"""
+        if not len(self.snapshots):
             return {}
 
-        # Baseline phase (before attack)
-        baseline_phase = [s for s in self.snapshots if s.get('attack_percent', 0) == 0]
+        interval = self._intervals
+        total = self.snapshots['total_packets']
+        attack_percent = self.snapshots['attack_percent']
+        detected = self.snapshots['alert_code'] != 0
 
-        # Attack phase
-        attack_phase = [s for s in self.snapshots if s.get('attack_percent', 0) > 0]
+        # Baseline phase (before attack) and attack phase
+        baseline_mask = self._baseline_mask
+        attack_mask = self._attack_mask
+        baseline_idx = np.flatnonzero(baseline_mask)
+        attack_idx = np.flatnonzero(attack_mask)
+        n_baseline = len(baseline_idx)
+        n_attack = len(attack_idx)
 
         metrics = {
             'total_snapshots': len(self.snapshots),
-            'baseline_snapshots': len(baseline_phase),
-            'attack_snapshots': len(attack_phase),
-            'total_duration': self.snapshots[-1]['interval'],
+            'baseline_snapshots': n_baseline,
+            'attack_snapshots': n_attack,
+            'total_duration': int(interval[-1]),
         }
 
-        if baseline_phase:
-            last_baseline = baseline_phase[-1]
-            metrics['baseline_duration'] = last_baseline['interval']
-            metrics['baseline_total_packets'] = last_baseline['total_packets']
-            metrics['baseline_avg_pps'] = last_baseline['total_packets'] / last_baseline['interval']
-            metrics['baseline_unique_ips'] = last_baseline['unique_ips']
+        if n_baseline:
+            last_baseline = baseline_idx[-1]
+            metrics['baseline_duration'] = int(interval[last_baseline])
+            metrics['baseline_total_packets'] = int(total[last_baseline])
+            metrics['baseline_avg_pps'] = int(total[last_baseline]) / int(interval[last_baseline])
+            metrics['baseline_unique_ips'] = int(self.snapshots['unique_ips'][last_baseline])
 
             # Calculate Gbps and link utilization for baseline
             metrics['baseline_gbps'] = self.pps_to_gbps(metrics['baseline_avg_pps'])
             metrics['baseline_link_utilization'] = self.calculate_link_utilization(metrics['baseline_gbps'])
 
-        if attack_phase:
-            first_attack = attack_phase[0]
-            last_attack = attack_phase[-1]
+        if n_attack:
+            first_attack = attack_idx[0]
+            last_attack = attack_idx[-1]
 
             # Attack packets
-            total_attack_packets = last_attack.get('attack_packets', 0)
-            attack_duration = last_attack['interval'] - first_attack['interval'] + 5
+            total_attack_packets = int(self.snapshots['attack_packets'][last_attack])
+            attack_duration = int(interval[last_attack] - interval[first_attack]) + 5
 
-            metrics['attack_start_time'] = first_attack['interval']
+            metrics['attack_start_time'] = int(interval[first_attack])
             metrics['attack_duration'] = attack_duration
             metrics['total_attack_packets'] = total_attack_packets
             metrics['attack_avg_pps'] = total_attack_packets / attack_duration if attack_duration > 0 else 0
@@ -160,60 +269,57 @@ class HTTPFloodAnalyzer:
             metrics['attack_gbps'] = self.pps_to_gbps(metrics['attack_avg_pps'])
             metrics['attack_link_utilization'] = self.calculate_link_utilization(metrics['attack_gbps'])
 
-            # Calculate total traffic during attack phase (baseline + attack)
-            total_pps_during_attack = []
-            for i, s in enumerate(attack_phase):
-                if i == 0:
-                    prev_total = baseline_phase[-1]['total_packets'] if baseline_phase else 0
-                else:
-                    prev_total = attack_phase[i-1]['total_packets']
-                pps = (s['total_packets'] - prev_total) / 5
-                total_pps_during_attack.append(pps)
+            # Calculate total traffic during attack phase (baseline + attack):
+            # each attack snapshot against the previous attack snapshot, the
+            # first one against the last baseline snapshot
+            prev_total = total[baseline_idx[-1]] if n_baseline else 0
+            total_pps_during_attack = np.diff(total[attack_idx], prepend=prev_total) / 5.0
 
-            metrics['total_avg_pps_during_attack'] = np.mean(total_pps_during_attack) if total_pps_during_attack else 0
+            metrics['total_avg_pps_during_attack'] = float(total_pps_during_attack.mean())
             metrics['total_gbps_during_attack'] = self.pps_to_gbps(metrics['total_avg_pps_during_attack'])
             metrics['total_link_utilization_during_attack'] = self.calculate_link_utilization(metrics['total_gbps_during_attack'])
 
             # Maximum attack percentage
-            metrics['max_attack_percent'] = max(s.get('attack_percent', 0) for s in attack_phase)
-            metrics['avg_attack_percent'] = np.mean([s.get('attack_percent', 0) for s in attack_phase])
+            metrics['max_attack_percent'] = float(attack_percent[attack_mask].max())
+            metrics['avg_attack_percent'] = float(attack_percent[attack_mask].mean())
 
             # Time to first detection
-            first_detection = next((s for s in self.snapshots if s.get('alert_level') not in ['NONE', None]), None)
-            if first_detection:
-                metrics['time_to_detection'] = first_detection['interval']
-                metrics['detection_alert_level'] = first_detection['alert_level']
+            detected_idx = np.flatnonzero(detected)
+            if len(detected_idx):
+                first_detection = detected_idx[0]
+                metrics['time_to_detection'] = int(interval[first_detection])
+                metrics['detection_alert_level'] = self.ALERT_LEVELS[self.snapshots['alert_code'][first_detection]]
 
                 # Detection delay (time between attack start and detection)
-                if first_detection['interval'] >= metrics['attack_start_time']:
-                    metrics['detection_delay'] = first_detection['interval'] - metrics['attack_start_time']
+                if metrics['time_to_detection'] >= metrics['attack_start_time']:
+                    metrics['detection_delay'] = metrics['time_to_detection'] - metrics['attack_start_time']
                 else:
                     metrics['detection_delay'] = 0
 
             # Alerts generated
-            alert_counts = {'NONE': 0, 'LOW': 0, 'MEDIUM': 0, 'HIGH': 0}
-            for s in self.snapshots:
-                level = s.get('alert_level', 'NONE')
-                alert_counts[level] = alert_counts.get(level, 0) + 1
+            counts = np.bincount(self.snapshots['alert_code'], minlength=len(self.ALERT_LEVELS))
+            alert_counts = {level: int(count) for level, count in zip(self.ALERT_LEVELS[:4], counts)}
+            if counts[4]:
+                alert_counts['CRITICAL'] = int(counts[4])
 
             metrics['alert_counts'] = alert_counts
 
             # Maximum heavy hitters
-            metrics['max_heavy_hitters'] = max(s.get('heavy_hitters', 0) for s in self.snapshots)
+            metrics['max_heavy_hitters'] = int(self.snapshots['heavy_hitters'].max())
 
             # Detection accuracy during attack
-            attack_detected = sum(1 for s in attack_phase if s.get('alert_level') not in ['NONE', None])
-            metrics['detection_rate'] = (attack_detected / len(attack_phase) * 100) if attack_phase else 0
+            attack_detected = int(detected[attack_mask].sum())
+            metrics['detection_rate'] = attack_detected / n_attack * 100
 
             # False positives (alerts during baseline)
-            baseline_alerts = sum(1 for s in baseline_phase if s.get('alert_level') not in ['NONE', None])
+            baseline_alerts = int(detected[baseline_mask].sum())
             metrics['false_positives'] = baseline_alerts
-            metrics['false_positive_rate'] = (baseline_alerts / len(baseline_phase) * 100) if baseline_phase else 0
+            metrics['false_positive_rate'] = (baseline_alerts / n_baseline * 100) if n_baseline else 0
 
             # True positives (HIGH alerts during attack)
-            high_alerts_attack = sum(1 for s in attack_phase if s.get('alert_level') == 'HIGH')
+            high_alerts_attack = int((self.snapshots['alert_code'][attack_mask] == self._ALERT_CODES['HIGH']).sum())
             metrics['true_positives'] = high_alerts_attack
-            metrics['true_positive_rate'] = (high_alerts_attack / len(attack_phase) * 100) if attack_phase else 0
+            metrics['true_positive_rate'] = high_alerts_attack / n_attack * 100
 
         return metrics
 
@@ -297,20 +403,40 @@ class HTTPFloodAnalyzer:
 
         return metrics
 
+    @staticmethod
+    def _fill_steps(ax, x, heights, colors, alpha=0.7):
+        """Draw a bar series as one filled step path per colour (long runs)"""
+        colors = np.asarray(colors)
+        for color in dict.fromkeys(colors.tolist()):
+            ax.fill_between(x, heights, where=colors == color, step='mid',
+                            color=color, alpha=alpha, linewidth=0)
+
+    @staticmethod
+    def _window_max(values, stride):
+        """Maximum over each run of stride values, so decimation keeps bursts and peaks"""
+        values = np.asarray(values)
+        if stride == 1:
+            return values
+        return np.maximum.reduceat(values, np.arange(0, len(values), stride))
+
     def plot_traffic_overview(self):
         """Generate comprehensive traffic overview"""
-        if not self.snapshots:
+        if not len(self.snapshots):
             print("No data to plot")
             return
 
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('HTTP Flood Attack - Traffic Analysis', fontsize=16, fontweight='bold')
 
-        intervals = [s['interval'] for s in self.snapshots]
-        total_packets = [s['total_packets'] for s in self.snapshots]
-        baseline_packets = [s.get('baseline_packets', 0) for s in self.snapshots]
-        attack_packets = [s.get('attack_packets', 0) for s in self.snapshots]
-        attack_percent = [s.get('attack_percent', 0) for s in self.snapshots]
+        # Long runs: one point per window of stride snapshots, at the window
+        # start, holding the window maximum (cumulative counts: its last value)
+        stride = max(1, len(self.snapshots) // self._MAX_PLOT_POINTS)
+        dense = stride > 1
+        intervals = self._intervals[::stride]
+        total_packets = self._window_max(self.snapshots['total_packets'], stride)
+        baseline_packets = self._window_max(self.snapshots['baseline_packets'], stride)
+        attack_packets = self._window_max(self.snapshots['attack_packets'], stride)
+        attack_percent = self._window_max(self.snapshots['attack_percent'], stride)
 
         # 1. Cumulative packets (baseline vs attack)
         ax1 = axes[0, 0]
@@ -326,8 +452,11 @@ class HTTPFloodAnalyzer:
 
         # 2. Attack percentage over time
         ax2 = axes[0, 1]
-        colors = ['green' if p == 0 else 'orange' if p < 30 else 'red' for p in attack_percent]
-        ax2.bar(intervals, attack_percent, width=4, color=colors, alpha=0.7, edgecolor='black')
+        colors = self._SEVERITY_COLORS[np.select([attack_percent == 0, attack_percent < 30], [0, 1], 2)]
+        if dense:
+            self._fill_steps(ax2, intervals, attack_percent, colors)
+        else:
+            ax2.bar(intervals, attack_percent, width=4, color=colors, alpha=0.7, edgecolor='black')
         ax2.axhline(y=30, color='red', linestyle='--', linewidth=2, label='Critical threshold (30%)')
         ax2.set_xlabel('Time (seconds)', fontsize=12)
         ax2.set_ylabel('Attack Traffic (%)', fontsize=12)
@@ -338,19 +467,9 @@ class HTTPFloodAnalyzer:
 
         # 3. Packet rate (PPS) - incremental
         ax3 = axes[1, 0]
-        pps_baseline = []
-        pps_attack = []
-        pps_total = []
-
-        for i in range(len(self.snapshots)):
-            if i == 0:
-                pps_baseline.append(baseline_packets[i] / 5)
-                pps_attack.append(attack_packets[i] / 5)
-                pps_total.append(total_packets[i] / 5)
-            else:
-                pps_baseline.append((baseline_packets[i] - baseline_packets[i-1]) / 5)
-                pps_attack.append((attack_packets[i] - attack_packets[i-1]) / 5)
-                pps_total.append((total_packets[i] - total_packets[i-1]) / 5)
+        pps_baseline = self._window_max(np.diff(self.snapshots['baseline_packets'], prepend=0) / 5.0, stride)
+        pps_attack = self._window_max(np.diff(self.snapshots['attack_packets'], prepend=0) / 5.0, stride)
+        pps_total = self._window_max(np.diff(self.snapshots['total_packets'], prepend=0) / 5.0, stride)
 
         ax3.plot(intervals, pps_total, 'k-', linewidth=2, marker='o', markersize=3, label='Total PPS', alpha=0.7)
         ax3.plot(intervals, pps_baseline, 'g-', linewidth=2, marker='o', markersize=3, label='Baseline PPS', alpha=0.7)
@@ -364,22 +483,15 @@ class HTTPFloodAnalyzer:
 
         # 4. Alert levels over time
         ax4 = axes[1, 1]
-        alert_levels = [s.get('alert_level', 'NONE') for s in self.snapshots]
-        alert_numeric = []
-        for level in alert_levels:
-            if level == 'NONE':
-                alert_numeric.append(0)
-            elif level == 'LOW':
-                alert_numeric.append(1)
-            elif level == 'MEDIUM':
-                alert_numeric.append(2)
-            elif level == 'HIGH':
-                alert_numeric.append(3)
-            else:
-                alert_numeric.append(0)
+        # The axis stops at HIGH, so CRITICAL is drawn as HIGH
+        alert_numeric = np.minimum(self._window_max(self.snapshots['alert_code'], stride),
+                                   self._ALERT_CODES['HIGH'])
 
-        colors_alert = ['green' if a == 0 else 'yellow' if a == 1 else 'orange' if a == 2 else 'red' for a in alert_numeric]
-        ax4.bar(intervals, alert_numeric, width=4, color=colors_alert, alpha=0.7, edgecolor='black')
+        colors_alert = self._ALERT_COLORS[alert_numeric]
+        if dense:
+            self._fill_steps(ax4, intervals, alert_numeric, colors_alert)
+        else:
+            ax4.bar(intervals, alert_numeric, width=4, color=colors_alert, alpha=0.7, edgecolor='black')
         ax4.set_xlabel('Time (seconds)', fontsize=12)
         ax4.set_ylabel('Alert Level', fontsize=12)
         ax4.set_title('Detection System Alert Status', fontsize=14, fontweight='bold')
@@ -398,39 +510,35 @@ class HTTPFloodAnalyzer:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '01_traffic_overview.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, pil_kwargs=self._PNG_OPTIONS)
         plt.close()
 
         print(f"\n[FIGURE 1: Traffic Overview] - Saved to {output_path}")
 
     def plot_detection_efficacy(self):
         """Generate detection efficacy analysis"""
-        if not self.snapshots:
+        if not len(self.snapshots):
             print("No data to plot")
             return
 
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle('Detection System Efficacy Analysis', fontsize=16, fontweight='bold')
 
-        intervals = [s['interval'] for s in self.snapshots]
+        intervals = self._intervals
         metrics = self.calculate_metrics()
 
         # 1. Detection timeline
         ax1 = axes[0, 0]
-        attack_percent = [s.get('attack_percent', 0) for s in self.snapshots]
-        alert_levels = [s.get('alert_level', 'NONE') for s in self.snapshots]
+        attack_percent = self.snapshots['attack_percent']
 
         # Plot attack intensity
         ax1_twin = ax1.twinx()
         line1 = ax1.plot(intervals, attack_percent, 'r-', linewidth=3, label='Attack Intensity (%)', alpha=0.7)
 
         # Plot detection events
-        detection_times = []
-        detection_levels = []
-        for i, s in enumerate(self.snapshots):
-            if s.get('alert_level') == 'HIGH':
-                detection_times.append(s['interval'])
-                detection_levels.append(s.get('attack_percent', 0))
+        high_alert = self.snapshots['alert_code'] == self._ALERT_CODES['HIGH']
+        detection_times = intervals[high_alert]
+        detection_levels = attack_percent[high_alert]
 
         line2 = ax1.scatter(detection_times, detection_levels, color='darkred', s=100, marker='X',
                            label='HIGH Alert', zorder=5, edgecolors='black', linewidths=1)
@@ -455,8 +563,8 @@ class HTTPFloodAnalyzer:
 
         # 2. Heavy hitters detection
         ax2 = axes[0, 1]
-        unique_ips = [s.get('unique_ips', 0) for s in self.snapshots]
-        heavy_hitters = [s.get('heavy_hitters', 0) for s in self.snapshots]
+        unique_ips = self.snapshots['unique_ips']
+        heavy_hitters = self.snapshots['heavy_hitters']
 
         ax2_twin = ax2.twinx()
         line1 = ax2.plot(intervals, unique_ips, 'b-', linewidth=2, marker='o', markersize=3, label='Unique IPs', alpha=0.7)
@@ -478,17 +586,20 @@ class HTTPFloodAnalyzer:
         # 3. Detection confusion matrix
         ax3 = axes[1, 0]
 
-        baseline_phase = [s for s in self.snapshots if s.get('attack_percent', 0) == 0]
-        attack_phase = [s for s in self.snapshots if s.get('attack_percent', 0) > 0]
+        codes = self.snapshots['alert_code']
+        baseline_mask = self._baseline_mask
+        attack_mask = self._attack_mask
+        no_alert = codes == self._ALERT_CODES['NONE']
+        high_alert = codes == self._ALERT_CODES['HIGH']
 
         # True Negatives: Baseline with no alert
-        tn = sum(1 for s in baseline_phase if s.get('alert_level') in ['NONE', None])
+        tn = int((no_alert & baseline_mask).sum())
         # False Positives: Baseline with alert
-        fp = sum(1 for s in baseline_phase if s.get('alert_level') not in ['NONE', None])
+        fp = int((~no_alert & baseline_mask).sum())
         # True Positives: Attack with HIGH alert
-        tp = sum(1 for s in attack_phase if s.get('alert_level') == 'HIGH')
+        tp = int((high_alert & attack_mask).sum())
         # False Negatives: Attack with no HIGH alert
-        fn = sum(1 for s in attack_phase if s.get('alert_level') != 'HIGH')
+        fn = int((~high_alert & attack_mask).sum())
 
         confusion_matrix = np.array([[tn, fp], [fn, tp]])
 
@@ -557,14 +668,14 @@ Attack Profile:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '02_detection_efficacy.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, pil_kwargs=self._PNG_OPTIONS)
         plt.close()
 
         print(f"\n[FIGURE 2: Detection Efficacy] - Saved to {output_path}")
 
     def plot_baseline_vs_attack(self):
         """Generate baseline vs attack comparison"""
-        if not self.snapshots:
+        if not len(self.snapshots):
             print("No data to plot")
             return
 
@@ -572,7 +683,7 @@ Attack Profile:
         fig.suptitle('Baseline vs Attack Traffic Comparison', fontsize=16, fontweight='bold')
 
         metrics = self.calculate_metrics()
-        intervals = [s['interval'] for s in self.snapshots]
+        intervals = self._intervals
 
         # 1. Packet distribution comparison
         ax1 = axes[0, 0]
@@ -601,18 +712,12 @@ Attack Profile:
 
         # Add value labels on bars
         for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                ax1.annotate(f'{height:,.0f}',
-                            xy=(bar.get_x() + bar.get_width() / 2, height),
-                            xytext=(0, 3),
-                            textcoords="offset points",
-                            ha='center', va='bottom', fontsize=9)
+            ax1.bar_label(bars, fmt='{:,.0f}', padding=3, fontsize=9)
 
         # 2. HTTP methods distribution
         ax2 = axes[0, 1]
-        get_percent = [s.get('get_percent', 0) for s in self.snapshots]
-        post_percent = [s.get('post_percent', 0) for s in self.snapshots]
+        get_percent = self.snapshots['get_percent']
+        post_percent = self.snapshots['post_percent']
 
         ax2.plot(intervals, get_percent, 'g-', linewidth=2, marker='o', markersize=3, label='GET %', alpha=0.7)
         ax2.plot(intervals, post_percent, 'b-', linewidth=2, marker='s', markersize=3, label='POST %', alpha=0.7)
@@ -680,61 +785,39 @@ Attack Profile:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '03_baseline_vs_attack.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, pil_kwargs=self._PNG_OPTIONS)
         plt.close()
 
         print(f"\n[FIGURE 3: Baseline vs Attack] - Saved to {output_path}")
 
     def plot_link_utilization(self):
         """Generate link utilization analysis"""
-        if not self.snapshots:
+        if not len(self.snapshots):
             print("No data to plot")
             return
 
         fig, axes = plt.subplots(2, 2, figsize=(16, 12))
         fig.suptitle(f'Link Utilization Analysis ({self.link_capacity_gbps}G Link)', fontsize=16, fontweight='bold')
 
-        intervals = [s['interval'] for s in self.snapshots]
-        total_packets = [s['total_packets'] for s in self.snapshots]
-        baseline_packets = [s.get('baseline_packets', 0) for s in self.snapshots]
-        attack_packets = [s.get('attack_packets', 0) for s in self.snapshots]
-
-        # Calculate PPS and Gbps for each interval
-        pps_total = []
-        pps_baseline = []
-        pps_attack = []
-        gbps_total = []
-        gbps_baseline = []
-        gbps_attack = []
-        utilization_total = []
-
-        for i in range(len(self.snapshots)):
-            if i == 0:
-                pps_t = total_packets[i] / 5
-                pps_b = baseline_packets[i] / 5
-                pps_a = attack_packets[i] / 5
-            else:
-                pps_t = (total_packets[i] - total_packets[i-1]) / 5
-                pps_b = (baseline_packets[i] - baseline_packets[i-1]) / 5
-                pps_a = (attack_packets[i] - attack_packets[i-1]) / 5
-
-            pps_total.append(pps_t)
-            pps_baseline.append(pps_b)
-            pps_attack.append(pps_a)
+        intervals = self._intervals
+        total_packets = self.snapshots['total_packets']
+        baseline_packets = self.snapshots['baseline_packets']
+        attack_packets = self.snapshots['attack_packets']
 
-            gbps_t = self.pps_to_gbps(pps_t)
-            gbps_b = self.pps_to_gbps(pps_b)
-            gbps_a = self.pps_to_gbps(pps_a)
+        # Calculate PPS and Gbps for each interval (counters are cumulative)
+        pps_total = np.diff(total_packets, prepend=0) / 5
+        pps_baseline = np.diff(baseline_packets, prepend=0) / 5
+        pps_attack = np.diff(attack_packets, prepend=0) / 5
 
-            gbps_total.append(gbps_t)
-            gbps_baseline.append(gbps_b)
-            gbps_attack.append(gbps_a)
-            utilization_total.append(self.calculate_link_utilization(gbps_t))
+        gbps_total = self.pps_to_gbps(pps_total)
+        gbps_baseline = self.pps_to_gbps(pps_baseline)
+        gbps_attack = self.pps_to_gbps(pps_attack)
+        utilization_total = self.calculate_link_utilization(gbps_total)
 
         # 1. Throughput over time (Gbps)
         ax1 = axes[0, 0]
         ax1.fill_between(intervals, 0, gbps_baseline, alpha=0.5, color='green', label='Baseline')
-        ax1.fill_between(intervals, gbps_baseline, [b + a for b, a in zip(gbps_baseline, gbps_attack)],
+        ax1.fill_between(intervals, gbps_baseline, gbps_baseline + gbps_attack,
                         alpha=0.5, color='red', label='Attack')
         ax1.plot(intervals, gbps_total, 'k-', linewidth=2, label='Total', zorder=3)
         ax1.axhline(y=self.link_capacity_gbps, color='purple', linestyle='--', linewidth=2,
@@ -744,12 +827,16 @@ Attack Profile:
         ax1.set_title('Network Throughput Over Time', fontsize=14, fontweight='bold')
         ax1.legend(loc='upper left')
         ax1.grid(True, alpha=0.3)
-        ax1.set_ylim(0, max(max(gbps_total) * 1.2, self.link_capacity_gbps * 0.5))
+        ax1.set_ylim(0, max(gbps_total.max() * 1.2, self.link_capacity_gbps * 0.5))
 
         # 2. Link utilization percentage
         ax2 = axes[0, 1]
-        colors = ['green' if u < 50 else 'orange' if u < 80 else 'red' for u in utilization_total]
-        ax2.bar(intervals, utilization_total, width=4, color=colors, alpha=0.7, edgecolor='black')
+        colors = self._SEVERITY_COLORS[np.select([utilization_total < 50, utilization_total < 80], [0, 1], 2)]
+        if len(self.snapshots) > self._MAX_PLOT_POINTS:
+            # Long runs: one filled step path per colour instead of one bar per snapshot
+            self._fill_steps(ax2, intervals, utilization_total, colors)
+        else:
+            ax2.bar(intervals, utilization_total, width=4, color=colors, alpha=0.7, edgecolor='black')
         ax2.axhline(y=50, color='orange', linestyle='--', linewidth=1, alpha=0.7, label='50% threshold')
         ax2.axhline(y=80, color='red', linestyle='--', linewidth=2, label='80% threshold')
         ax2.set_xlabel('Time (seconds)', fontsize=12)
@@ -794,21 +881,8 @@ Attack Profile:
         ax3_twin.set_ylim(0, 100)
 
         # Add value labels
-        for bar in bars1:
-            height = bar.get_height()
-            ax3.annotate(f'{height:.1f}',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),
-                        textcoords="offset points",
-                        ha='center', va='bottom', fontsize=9, fontweight='bold')
-
-        for bar in bars2:
-            height = bar.get_height()
-            ax3_twin.annotate(f'{height:.1f}%',
-                             xy=(bar.get_x() + bar.get_width() / 2, height),
-                             xytext=(0, 3),
-                             textcoords="offset points",
-                             ha='center', va='bottom', fontsize=9, fontweight='bold')
+        ax3.bar_label(bars1, fmt='{:.1f}', padding=3, fontsize=9, fontweight='bold')
+        ax3_twin.bar_label(bars2, fmt='{:.1f}%', padding=3, fontsize=9, fontweight='bold')
 
         # Combine legends
         lines1, labels1 = ax3.get_legend_handles_labels()
@@ -819,9 +893,9 @@ Attack Profile:
         ax4 = axes[1, 1]
         ax4.axis('off')
 
-        avg_utilization = np.mean(utilization_total)
-        max_utilization = max(utilization_total)
-        min_utilization = min(utilization_total)
+        avg_utilization = utilization_total.mean()
+        max_utilization = utilization_total.max()
+        min_utilization = utilization_total.min()
 
         summary_text = f"""
 LINK UTILIZATION SUMMARY
@@ -856,7 +930,7 @@ Capacity Status:
 
         # Save figure
         output_path = os.path.join(self.output_dir, '04_link_utilization.png')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=self.dpi, pil_kwargs=self._PNG_OPTIONS)
         plt.close()
 
         print(f"\n[FIGURE 4: Link Utilization] - Saved to {output_path}")
@@ -11,27 +11,29 @@ Tipos de ataque:
 5. Mixed Flood: Combinación de varios tipos
 """
 
-import sys
 import random
 import argparse
+import heapq
 import os
+import multiprocessing
+import socket
+import struct
+import time
 from datetime import datetime
 
-try:
-    from scapy.all import *
-    from scapy.layers.inet import IP, TCP
-    from scapy.layers.l2 import Ether
-except ImportError:
-    print("Error: Scapy no está instalado")
-    print("Instalar con: pip install scapy")
-    sys.exit(1)
-
 # Configuración de red (Atacante -> Monitor)
 DEFAULT_SRC_IP = "203.0.113.0"         # Red del atacante
 DEFAULT_DST_IP = "10.0.0.1"            # Monitor (víctima)
 DEFAULT_SRC_MAC = "aa:bb:cc:dd:ee:ff"  # MAC atacante
 DEFAULT_DST_MAC = "0c:42:a1:8c:dd:0c"  # MAC del Monitor
 
+# Cabecera global PCAP (microsegundos, v2.4, snaplen 65535, enlace Ethernet)
+PCAP_GLOBAL_HEADER = struct.pack('<IHHIIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+_PCAP_RECORD = struct.Struct('<IIII')
+
+# Por debajo de este número de paquetes no compensa arrancar procesos
+PARALLEL_MIN_PACKETS = 100000
+
 # Patrones de ataque HTTP flood
 ATTACK_PATTERNS = {
     'get_flood': {
@@ -99,62 +101,242 @@ def generate_random_path():
         suffix = random.choice(suffixes)
         return f"{prefix}{random_str}{suffix}"
 
-def create_http_flood_packet(src_ip, dst_ip, src_mac, dst_mac, attack_type, src_port=None):
-    """Crea un paquete de ataque HTTP flood"""
-
-    if src_port is None:
-        src_port = random.randint(1024, 65535)
+def make_request_builder(dst_ip, attack_type):
+    """Devuelve una funcion sin argumentos que construye payloads HTTP (bytes) del ataque
 
-    dst_port = 80
+    El patron se desempaqueta una sola vez y las partes fijas de la peticion
+    (metodo, paths, y el resto de la cabecera para cada User-Agent) se
+    serializan a bytes por adelantado; por peticion solo quedan las elecciones
+    aleatorias y unas pocas concatenaciones.
+    """
     pattern = ATTACK_PATTERNS[attack_type]
+    paths = pattern['paths']
+    random_paths = paths == 'random'
+    paths = None if random_paths else [path.encode() for path in paths]
+    incomplete = pattern.get('incomplete', False)
+    choice = random.choice
+    randint = random.randint
+
+    # Por método: (b'METODO ', es POST, tramo tras el path para cada User-Agent)
+    methods = []
+    for method in pattern['methods']:
+        post = method == 'POST' and not incomplete
+        tails = []
+        for user_agent in MALICIOUS_USER_AGENTS:
+            tail = f" HTTP/1.1\r\nHost: {dst_ip}\r\n"
+            if user_agent:
+                tail += f"User-Agent: {user_agent}\r\n"
+
+            # Para Slowloris, headers incompletos (no se cierra la petición)
+            if incomplete:
+                tail += "X-Slowloris: "
+            elif post:
+                tail += "Content-Type: application/json\r\nContent-Length: "
+            else:
+                tail += "Connection: close\r\n\r\n"
+            tails.append(tail.encode())
+        methods.append((f"{method} ".encode(), post, tails))
+
+    def build():
+        # Seleccionar método
+        method, post, tails = choice(methods)
+
+        # Seleccionar path
+        path = generate_random_path().encode() if random_paths else choice(paths)
+
+        # User-Agent malicioso
+        request = method + path + choice(tails)
+        if post:
+            body = b'{"user":"bot%d","pass":"attack"}' % randint(1, 9999)
+            request += b'%d\r\n\r\n' % len(body) + body
+        return request
+
+    return build
+
+def build_http_request(dst_ip, attack_type):
+    """Construye el payload HTTP (bytes) de una peticion de ataque"""
+    return make_request_builder(dst_ip, attack_type)()
 
-    # Seleccionar método
-    method = random.choice(pattern['methods'])
-
-    # Seleccionar path
-    if pattern['paths'] == 'random':
-        path = generate_random_path()
-    else:
-        path = random.choice(pattern['paths'])
-
-    # User-Agent malicioso
-    user_agent = random.choice(MALICIOUS_USER_AGENTS)
+def create_http_flood_packet(src_ip, dst_ip, src_mac, dst_mac, attack_type, src_port=None):
+    """Crea un paquete de ataque HTTP flood (Scapy)
 
-    # Construir petición HTTP
-    http_request = f"{method} {path} HTTP/1.1\r\n"
-    http_request += f"Host: {dst_ip}\r\n"
+    La generación de tráfico no usa Scapy (ver build_http_flood_frame); solo
+    esta función lo necesita, así que se importa aquí y no al cargar el módulo.
+    """
+    from scapy.layers.inet import IP, TCP
+    from scapy.layers.l2 import Ether
+    from scapy.packet import Raw
 
-    if user_agent:
-        http_request += f"User-Agent: {user_agent}\r\n"
+    if src_port is None:
+        src_port = random.randint(1024, 65535)
 
-    # Para Slowloris, headers incompletos
-    if pattern.get('incomplete', False):
-        http_request += "X-Slowloris: "
-        # No cerrar la petición
-    else:
-        if method == 'POST':
-            body = f'{{"user":"bot{random.randint(1,9999)}","pass":"attack"}}'
-            http_request += "Content-Type: application/json\r\n"
-            http_request += f"Content-Length: {len(body)}\r\n"
-            http_request += f"\r\n{body}"
-        else:
-            http_request += "Connection: close\r\n"
-            http_request += "\r\n"
+    http_request = build_http_request(dst_ip, attack_type)
 
     # Construir paquete
     pkt = Ether(src=src_mac, dst=dst_mac) / \
           IP(src=src_ip, dst=dst_ip, id=random.randint(1, 65535)) / \
-          TCP(sport=src_port, dport=dst_port, flags='PA',
+          TCP(sport=src_port, dport=80, flags='PA',
               seq=random.randint(1000, 100000),
               ack=random.randint(1000, 100000)) / \
           Raw(load=http_request)
 
     return pkt
 
+def _sum16(data):
+    """Suma (sin plegar) de las palabras de 16 bits big-endian de data"""
+    if len(data) % 2:
+        data += b'\x00'
+    return sum(struct.unpack(f'!{len(data) // 2}H', data))
+
+def _fold16(total):
+    """Pliega una suma de palabras a 16 bits y la complementa (checksum final)"""
+    total = (total & 0xffff) + (total >> 16)
+    total = (total & 0xffff) + (total >> 16)
+    return ~total & 0xffff
+
+def internet_checksum(data):
+    """Checksum de Internet (RFC 1071): complemento a uno de la suma de palabras de 16 bits"""
+    return _fold16(_sum16(data))
+
+def make_frame_template(src_mac, dst_mac, dst_ip):
+    """Plantilla de 54 bytes con las cabeceras Ethernet + IPv4 + TCP fijas del ataque
+
+    Mismos valores que Scapy por defecto (TTL 64, ventana 8192, flags PA, puerto 80);
+    longitud, id, IP origen, puerto origen, seq/ack y checksums se rellenan por paquete.
+    """
+    eth = bytes.fromhex(dst_mac.replace(':', '')) + bytes.fromhex(src_mac.replace(':', '')) + b'\x08\x00'
+    ip = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 0, 0, 0, 64, 6, 0, bytes(4), socket.inet_aton(dst_ip))
+    tcp = struct.pack('!HHIIBBHHH', 0, 80, 0, 0, 5 << 4, 0x18, 8192, 0, 0)
+    return bytes(eth + ip + tcp)
+
+def checksum_bases(template):
+    """Sumas parciales de la parte fija de los checksums IP y TCP de una plantilla
+
+    Los campos variables estan a cero en la plantilla, asi que por paquete solo
+    hay que sumar sus palabras (actualizacion incremental, RFC 1624) y el payload.
+    """
+    ip_base = _sum16(template[14:34])
+    # Pseudo-cabecera fija (IP destino + protocolo) + cabecera TCP fija
+    tcp_base = _sum16(template[30:34]) + 6 + _sum16(template[34:54])
+    return ip_base, tcp_base
+
+_IP_LEN_ID = struct.Struct('!HH')
+_IP_SRC_WORDS = struct.Struct('!HH')
+_TCP_SEQ_ACK = struct.Struct('!HHII')
+_CHECKSUM = struct.Struct('!H')
+
+def build_http_flood_frame(template, src_ip, src_port, ip_id, seq, ack, payload, bases=None):
+    """Trama completa a partir de la plantilla (src_ip como 4 bytes empaquetados)
+
+    bases son las sumas de checksum_bases(template); se calculan si no se pasan.
+    """
+    ip_base, tcp_base = bases or checksum_bases(template)
+    ip_len = 40 + len(payload)
+    src_hi, src_lo = _IP_SRC_WORDS.unpack(src_ip)
+
+    frame = bytearray(template)
+    _IP_LEN_ID.pack_into(frame, 16, ip_len, ip_id)
+    frame[26:30] = src_ip
+    # Puerto origen, puerto destino (fijo) y seq/ack
+    _TCP_SEQ_ACK.pack_into(frame, 34, src_port, 80, seq, ack)
+
+    _CHECKSUM.pack_into(frame, 24, _fold16(ip_base + ip_len + ip_id + src_hi + src_lo))
+
+    # Checksum TCP: pseudo-cabecera (IP origen + longitud TCP) + campos variables + payload
+    tcp_sum = (tcp_base + src_hi + src_lo + ip_len - 20 + src_port
+               + (seq >> 16) + (seq & 0xffff) + (ack >> 16) + (ack & 0xffff) + _sum16(payload))
+    _CHECKSUM.pack_into(frame, 50, _fold16(tcp_sum))
+    return bytes(frame) + payload
+
+def write_pcap(output_file, frames, batch_size=10000):
+    """Escribe tramas (timestamp, bytes) en formato PCAP sin pasar por Scapy
+
+    frames puede ser un generador: solo se mantiene en memoria un lote de
+    batch_size registros, que se vuelca con una unica escritura.
+    """
+    with open(output_file, 'wb') as f:
+        f.write(PCAP_GLOBAL_HEADER)
+        batch = []
+        for ts, frame in frames:
+            # Redondeo al microsegundo sobre el total: usec siempre queda en [0, 10**6)
+            sec, usec = divmod(int(round(ts * 1e6)), 1000000)
+            batch.append(_PCAP_RECORD.pack(sec, usec, len(frame), len(frame)))
+            batch.append(frame)
+            if len(batch) >= 2 * batch_size:
+                f.write(b''.join(batch))
+                batch.clear()
+        f.write(b''.join(batch))
+
+def generate_attack_frames(attack_type, num_packets, template, botnet_ips_packed, dst_ip, verbose=False):
+    """Genera las tramas de ataque (timestamp, bytes) una a una"""
+    build_request = make_request_builder(dst_ip, attack_type)
+    bases = checksum_bases(template)
+    choice = random.choice
+    randint = random.randint
+
+    # Solo se rellenan los campos variables de la plantilla
+    for i in range(num_packets):
+        src_ip = choice(botnet_ips_packed)
+        src_port = randint(1024, 65535)
+        payload = build_request()
+        frame = build_http_flood_frame(template, src_ip, src_port,
+                                       randint(1, 65535),
+                                       randint(1000, 100000),
+                                       randint(1000, 100000),
+                                       payload, bases)
+        yield time.time(), frame
+
+        if verbose and (i + 1) % 10000 == 0:
+            print(f"[*] Generados {i + 1}/{num_packets} paquetes...")
+
+def _generate_shard(args):
+    """Worker de multiprocessing.Pool: escribe un fragmento del ataque en su propio PCAP"""
+    shard_file, seed, attack_type, num_packets, template, botnet_ips_packed, dst_ip = args
+    random.seed(seed)
+    write_pcap(shard_file, generate_attack_frames(attack_type, num_packets, template,
+                                                  botnet_ips_packed, dst_ip))
+    return shard_file
+
+def _read_pcap_records(pcap_file):
+    """Registros de un PCAP escrito con write_pcap como ((seg, useg), cabecera + trama)"""
+    with open(pcap_file, 'rb', buffering=1 << 20) as f:
+        f.seek(len(PCAP_GLOBAL_HEADER))
+        while True:
+            header = f.read(_PCAP_RECORD.size)
+            if not header:
+                return
+            sec, usec, caplen, _ = _PCAP_RECORD.unpack(header)
+            yield (sec, usec), header + f.read(caplen)
+
+def merge_pcap_shards(output_file, shard_files, batch_size=10000):
+    """Une PCAPs del mismo tipo de enlace ordenando los registros por timestamp
+
+    Los fragmentos se generan a la vez en varios procesos, asi que sus
+    timestamps se solapan: concatenarlos dejaria saltos hacia atras. Cada
+    fragmento ya esta ordenado, basta una mezcla de k vias (heapq.merge).
+    """
+    with open(output_file, 'wb') as out:
+        out.write(PCAP_GLOBAL_HEADER)
+        batch = []
+        records = heapq.merge(*map(_read_pcap_records, shard_files), key=lambda record: record[0])
+        for _, record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                out.write(b''.join(batch))
+                batch.clear()
+        out.write(b''.join(batch))
+    for shard_file in shard_files:
+        os.remove(shard_file)
+
 def generate_attack_traffic(attack_type, num_packets, output_file,
                            src_ip_base, dst_ip, src_mac, dst_mac,
-                           botnet_size=100, verbose=False):
-    """Genera tráfico de ataque HTTP flood"""
+                           botnet_size=100, verbose=False, workers=None):
+    """Genera tráfico de ataque HTTP flood
+
+    Con workers > 1 (None: uno por CPU) y al menos PARALLEL_MIN_PACKETS paquetes,
+    cada proceso genera un fragmento con su propia semilla y los fragmentos se
+    mezclan por timestamp en output_file.
+    """
 
     print(f"[*] Generando ataque HTTP flood: {attack_type}")
     print(f"[*] Tipo: {ATTACK_PATTERNS[attack_type]['description']}")
@@ -163,27 +345,28 @@ def generate_attack_traffic(attack_type, num_packets, output_file,
     print(f"[*] Origen: {src_ip_base}/24 -> Destino: {dst_ip}")
     print(f"[*] Output: {output_file}\n")
 
-    packets = []
-
-    # Generar pool de IPs del botnet
-    ip_parts = src_ip_base.split('.')
-    botnet_ips = []
-    for _ in range(botnet_size):
-        bot_ip = f"{ip_parts[0]}.{ip_parts[1]}.{ip_parts[2]}.{random.randint(1, 254)}"
-        botnet_ips.append(bot_ip)
-
-    # Generar paquetes de ataque
-    for i in range(num_packets):
-        src_ip = random.choice(botnet_ips)
-        pkt = create_http_flood_packet(src_ip, dst_ip, src_mac, dst_mac, attack_type)
-        packets.append(pkt)
-
-        if verbose and (i + 1) % 10000 == 0:
-            print(f"[*] Generados {i + 1}/{num_packets} paquetes...")
-
-    # Guardar PCAP
-    print(f"[*] Guardando PCAP...")
-    wrpcap(output_file, packets)
+    template = make_frame_template(src_mac, dst_mac, dst_ip)
+
+    # Generar pool de IPs del botnet, ya empaquetadas (4 bytes): prefijo /24 + ultimo octeto
+    prefix = socket.inet_aton(src_ip_base)[:3]
+    last_octets = bytes(random.choices(range(1, 255), k=botnet_size))
+    botnet_ips_packed = [prefix + last_octets[i:i + 1] for i in range(botnet_size)]
+
+    # Generar paquetes de ataque y escribirlos en lotes a medida que se generan
+    workers = min(workers or os.cpu_count() or 1, num_packets)
+    if workers > 1 and num_packets >= PARALLEL_MIN_PACKETS:
+        print(f"[*] Generando y guardando PCAP en {workers} procesos...")
+        shards = [(f"{output_file}.part{k}", random.getrandbits(64), attack_type,
+                   num_packets // workers + (k < num_packets % workers),
+                   template, botnet_ips_packed, dst_ip)
+                  for k in range(workers)]
+        with multiprocessing.Pool(workers) as pool:
+            shard_files = pool.map(_generate_shard, shards)
+        merge_pcap_shards(output_file, shard_files)
+    else:
+        print(f"[*] Generando y guardando PCAP...")
+        frames = generate_attack_frames(attack_type, num_packets, template, botnet_ips_packed, dst_ip, verbose)
+        write_pcap(output_file, frames)
 
     # Estadísticas
     file_size = os.path.getsize(output_file)
@@ -191,7 +374,7 @@ def generate_attack_traffic(attack_type, num_packets, output_file,
     print(f"    Archivo: {output_file}")
     print(f"    Paquetes: {num_packets}")
     print(f"    Tamaño: {file_size / 1024 / 1024:.2f} MB")
-    print(f"    IPs atacantes: {len(set(botnet_ips))}")
+    print(f"    IPs atacantes: {len(set(botnet_ips_packed))}")
 
     print(f"\n[*] Características del ataque:")
     pattern = ATTACK_PATTERNS[attack_type]
@@ -239,6 +422,9 @@ Ejemplos:
                         help='Tamaño del botnet (default: 100)')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Modo verbose')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help=f'Procesos generadores (default: uno por CPU, '
+                             f'solo desde {PARALLEL_MIN_PACKETS} paquetes)')
 
     args = parser.parse_args()
 
@@ -253,7 +439,8 @@ Ejemplos:
         src_mac=args.src_mac,
         dst_mac=args.dst_mac,
         botnet_size=args.botnet_size,
-        verbose=args.verbose
+        verbose=args.verbose,
+        workers=args.workers
     )
 
     elapsed = (datetime.now() - start_time).total_seconds()
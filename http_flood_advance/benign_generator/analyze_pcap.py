@@ -4,19 +4,54 @@ Analizador de PCAPs de tráfico baseline
 Muestra estadísticas y verifica la calidad del tráfico generado
 """
 
+import os
+import re
 import sys
 import argparse
+from array import array
 from collections import Counter, defaultdict
 
-try:
-    from scapy.all import *
-except ImportError:
-    print("Error: Scapy no está instalado")
-    print("Instalar con: pip install scapy")
-    sys.exit(1)
-
-def analyze_pcap(pcap_file, max_packets=None, verbose=False):
-    """Analiza un PCAP y muestra estadísticas"""
+# Inicio de las peticiones HTTP reconocidas (método + espacio)
+_HTTP_METHODS = (b'GET ', b'POST ', b'PUT ', b'DELETE ', b'HEAD ')
+
+# Categoría de un path en una sola expresión compilada. Las alternativas se
+# prueban en orden de prioridad (Homepage exacto, luego subcadenas con
+# lookahead) y el grupo con nombre que encaja es la categoría
+_PATH_CATEGORY_RE = re.compile(
+    r'(?s)(?P<Homepage>(?:/|/index\.html|/home|/main)\Z)'
+    r'|(?=.*?/api/)(?P<API>)'
+    r'|(?=.*?\.(?:css|js|png|jpg|woff|ico))(?P<Static>)'
+    r'|(?=.*?/(?:search|products/|user/|forms/))(?P<Dynamic>)'
+    r'|(?=.*?/(?:ws|poll)/)(?P<Realtime>)'
+)
+
+# Paquetes entre volcados de las claves pendientes a los Counter
+_COUNT_BATCH = 10000
+
+def _ua_family(ua):
+    """Navegador de un User-Agent (Chrome, Firefox, Safari u Other)"""
+    if 'Chrome' in ua:
+        return 'Chrome'
+    elif 'Firefox' in ua:
+        return 'Firefox'
+    elif 'Safari' in ua:
+        return 'Safari'
+    return 'Other'
+
+def analyze_pcap(pcap_file, max_packets=None, verbose=False, http_ports=(80,)):
+    """Analiza un PCAP y muestra estadísticas
+
+    Solo se busca HTTP en segmentos TCP con algún puerto en http_ports
+    (None: en todos los segmentos TCP).
+    """
+    # Scapy se importa aquí y no al cargar el módulo: tarda segundos y no hace
+    # falta para --help ni para validar los argumentos
+    try:
+        from scapy.all import PcapReader, Ether, IP, TCP, Raw
+    except ImportError:
+        print("Error: Scapy no está instalado")
+        print("Instalar con: pip install scapy")
+        sys.exit(1)
 
     print(f"[*] Analizando: {pcap_file}\n")
 
@@ -29,84 +64,107 @@ def analyze_pcap(pcap_file, max_packets=None, verbose=False):
     http_methods = Counter()
     http_paths = Counter()
     http_hosts = Counter()
+    ua_strings = Counter()  # User-Agent completos, se simplifican al final
     user_agents = Counter()
 
-    packet_sizes = []
+    packet_sizes = array('I')  # Enteros sin caja: 4 bytes por paquete
     protocols = Counter()
 
-    # Leer PCAP
+    # Claves pendientes de contar: se acumulan en listas y se vuelcan a cada
+    # Counter con update() (conteo en C) cada _COUNT_BATCH paquetes
+    pending = [(counter, []) for counter in (ip_srcs, ip_dsts, tcp_sports, tcp_dports,
+                                             http_methods, http_paths, http_hosts, ua_strings)]
+    (src_keys, dst_keys, sport_keys, dport_keys,
+     method_keys, path_keys, host_keys, ua_keys) = [keys for _, keys in pending]
+
+    def flush_counts():
+        for counter, keys in pending:
+            counter.update(keys)
+            keys.clear()
+
+    # Leer PCAP en streaming: los paquetes se procesan uno a uno sin cargar
+    # el fichero entero, y con max_packets se deja de leer al llegar al limite
     try:
-        packets = rdpcap(pcap_file)
+        reader = PcapReader(pcap_file)
     except Exception as e:
         print(f"Error leyendo PCAP: {e}")
         sys.exit(1)
 
-    total_in_file = len(packets)
-    packets_to_analyze = packets[:max_packets] if max_packets else packets
-
-    print(f"[*] Paquetes en archivo: {total_in_file}")
-    if max_packets and max_packets < total_in_file:
+    print(f"[*] Tamaño del archivo: {os.path.getsize(pcap_file) / 1024 / 1024:.2f} MB")
+    if max_packets:
         print(f"[*] Analizando primeros: {max_packets}\n")
     else:
         print(f"[*] Analizando todos los paquetes\n")
 
     # Analizar cada paquete
-    for i, pkt in enumerate(packets_to_analyze):
-        total_packets += 1
-
-        # Tamaño
-        packet_sizes.append(len(pkt))
-
-        # Protocolo Ethernet
-        if pkt.haslayer(Ether):
-            protocols['Ethernet'] += 1
-
-        # IP
-        if pkt.haslayer(IP):
-            protocols['IP'] += 1
-            ip_srcs[pkt[IP].src] += 1
-            ip_dsts[pkt[IP].dst] += 1
-
-        # TCP
-        if pkt.haslayer(TCP):
-            protocols['TCP'] += 1
-            tcp_sports[pkt[TCP].sport] += 1
-            tcp_dports[pkt[TCP].dport] += 1
-
-            # HTTP (buscar en Raw payload)
-            if pkt.haslayer(Raw):
-                payload = pkt[Raw].load.decode('utf-8', errors='ignore')
-
-                # Detectar método HTTP
-                if payload.startswith(('GET ', 'POST ', 'PUT ', 'DELETE ', 'HEAD ')):
-                    lines = payload.split('\r\n')
-                    if len(lines) > 0:
-                        request_line = lines[0].split(' ')
+    with reader:
+        for i, pkt in enumerate(reader):
+            if max_packets and i >= max_packets:
+                break
+            total_packets += 1
+
+            # Tamaño
+            packet_sizes.append(len(pkt))
+
+            # Protocolo Ethernet
+            if pkt.haslayer(Ether):
+                protocols['Ethernet'] += 1
+
+            # IP (cada capa se busca una sola vez, sin haslayer + pkt[Capa])
+            ip = pkt.getlayer(IP)
+            if ip is not None:
+                protocols['IP'] += 1
+                src_keys.append(ip.src)
+                dst_keys.append(ip.dst)
+
+            # TCP
+            tcp = pkt.getlayer(TCP)
+            if tcp is not None:
+                protocols['TCP'] += 1
+                sport_keys.append(tcp.sport)
+                dport_keys.append(tcp.dport)
+
+                # HTTP (buscar en Raw payload, solo en los puertos HTTP)
+                if http_ports is None or tcp.sport in http_ports or tcp.dport in http_ports:
+                    raw = tcp.getlayer(Raw)
+                else:
+                    raw = None
+                if raw is not None:
+                    payload = raw.load
+
+                    # Detectar método HTTP sobre los bytes, antes de decodificar
+                    if payload.startswith(_HTTP_METHODS):
+                        # Solo se decodifica el bloque de cabeceras, nunca el cuerpo
+                        header_end = payload.find(b'\r\n\r\n')
+                        if header_end != -1:
+                            payload = payload[:header_end]
+                        lines = payload.decode('utf-8', errors='ignore').split('\r\n')
+
+                        request_line = lines[0].split(' ', 2)
                         if len(request_line) >= 2:
                             method = request_line[0]
                             path = request_line[1]
-                            http_methods[method] += 1
-                            http_paths[path] += 1
-
-                    # Host header
-                    for line in lines[1:]:
-                        if line.startswith('Host: '):
-                            host = line.split('Host: ')[1].strip()
-                            http_hosts[host] += 1
-                        elif line.startswith('User-Agent: '):
-                            ua = line.split('User-Agent: ')[1].strip()
-                            # Simplificar UA
-                            if 'Chrome' in ua:
-                                user_agents['Chrome'] += 1
-                            elif 'Firefox' in ua:
-                                user_agents['Firefox'] += 1
-                            elif 'Safari' in ua:
-                                user_agents['Safari'] += 1
-                            else:
-                                user_agents['Other'] += 1
-
-        if verbose and (i + 1) % 10000 == 0:
-            print(f"[*] Analizados {i + 1}/{len(packets_to_analyze)} paquetes...")
+                            method_keys.append(method)
+                            path_keys.append(path)
+
+                        # Host header
+                        for line in lines[1:]:
+                            if line.startswith('Host: '):
+                                host_keys.append(line[len('Host: '):].strip())
+                            elif line.startswith('User-Agent: '):
+                                ua_keys.append(line[len('User-Agent: '):].strip())
+
+            if (i + 1) % _COUNT_BATCH == 0:
+                flush_counts()
+
+            if verbose and (i + 1) % 10000 == 0:
+                print(f"[*] Analizados {i + 1} paquetes...")
+
+    flush_counts()
+
+    # Simplificar UA: cada User-Agent distinto se clasifica una sola vez
+    for ua, count in ua_strings.items():
+        user_agents[_ua_family(ua)] += count
 
     # Estadísticas generales
     print("\n" + "="*60)
@@ -188,18 +246,8 @@ def analyze_pcap(pcap_file, max_packets=None, verbose=False):
     }
 
     for path, count in http_paths.items():
-        if path in ['/', '/index.html', '/home', '/main']:
-            categories['Homepage'] += count
-        elif '/api/' in path:
-            categories['API'] += count
-        elif any(ext in path for ext in ['.css', '.js', '.png', '.jpg', '.woff', '.ico']):
-            categories['Static'] += count
-        elif any(word in path for word in ['/search', '/products/', '/user/', '/forms/']):
-            categories['Dynamic'] += count
-        elif any(word in path for word in ['/ws/', '/poll/']):
-            categories['Realtime'] += count
-        else:
-            categories['Other'] += count
+        match = _PATH_CATEGORY_RE.match(path)
+        categories[match.lastgroup if match else 'Other'] += count
 
     total_categorized = sum(categories.values())
     if total_categorized > 0:
@@ -231,6 +279,10 @@ Ejemplos:
                         help='Número máximo de paquetes a analizar (default: todos)')
     parser.add_argument('-v', '--verbose', action='store_true',
                         help='Mostrar progreso')
+    parser.add_argument('-p', '--http-ports', type=int, nargs='+', default=[80],
+                        help='Puertos TCP en los que se busca HTTP (default: 80)')
+    parser.add_argument('--all-ports', action='store_true',
+                        help='Buscar HTTP en todos los segmentos TCP')
 
     args = parser.parse_args()
 
@@ -240,7 +292,8 @@ Ejemplos:
         sys.exit(1)
 
     # Analizar
-    analyze_pcap(args.pcap_file, args.max_packets, args.verbose)
+    http_ports = None if args.all_ports else frozenset(args.http_ports)
+    analyze_pcap(args.pcap_file, args.max_packets, args.verbose, http_ports)
 
 if __name__ == '__main__':
     main()
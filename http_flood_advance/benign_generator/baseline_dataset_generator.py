@@ -15,21 +15,123 @@ Features:
 
 import os
 import sys
+import shutil
+import multiprocessing
 import time
-import random
 import argparse
 import json
-import math
+import socket
+import struct
 from datetime import datetime, timedelta
-from collections import defaultdict
+from contextlib import nullcontext
+from itertools import islice
+
+import numpy as np
 
 try:
-    from scapy.all import *
-    from scapy.layers.inet import IP, TCP
-    from scapy.layers.l2 import Ether
-except ImportError:
-    print("Error: Scapy not installed. Install with: pip install scapy")
-    sys.exit(1)
+    from numba import njit, prange, set_num_threads
+except ImportError:  # numba is optional: frames are then built one by one in Python
+    njit = None
+    prange = range
+    set_num_threads = None
+
+from packet_utils import PCAP_GLOBAL_HEADER, PCAP_RECORD, sum16, fold16
+
+_IP_TOTAL_LENGTH = struct.Struct('!H')
+_IP_SRC = struct.Struct('!I')
+_TCP_SPORT = struct.Struct('!H')
+_TCP_SEQ = struct.Struct('!I')
+_CHECKSUM = struct.Struct('!H')
+
+# Session cookie: "Cookie: session_id=" + 32 chars from [a-z0-9] + CRLF
+_COOKIE_PREFIX = np.frombuffer(b"Cookie: session_id=", np.uint8)
+_SESSION_ID_CHARS = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789", np.uint8)
+_COOKIE_LINE_LEN = len(_COOKIE_PREFIX) + 32 + 2
+
+
+def _fill_frames(out, frame_offsets, template, payloads, payload_offsets,
+                 src_ips, src_ports, seqs):
+    """
+    Assemble a batch of frames into out (flat uint8 buffer)
+
+    Frame i starts at frame_offsets[i]: the 54-byte header template with
+    IP total length, source IP/port and seq patched, followed by
+    payloads[payload_offsets[i]:payload_offsets[i + 1]]. Both checksums
+    are computed over the finished frame. JIT-compiled with numba.
+    """
+    for i in prange(len(src_ips)):
+        start = frame_offsets[i]
+        payload_len = payload_offsets[i + 1] - payload_offsets[i]
+        end = start + 54 + payload_len
+        frame = out[start:end]
+        frame[:54] = template
+        frame[54:] = payloads[payload_offsets[i]:payload_offsets[i + 1]]
+
+        ip_len = 40 + payload_len
+        frame[16] = ip_len >> 8
+        frame[17] = ip_len & 0xff
+        src_ip = src_ips[i]
+        frame[26] = src_ip >> 24
+        frame[27] = (src_ip >> 16) & 0xff
+        frame[28] = (src_ip >> 8) & 0xff
+        frame[29] = src_ip & 0xff
+        frame[34] = src_ports[i] >> 8
+        frame[35] = src_ports[i] & 0xff
+        seq = seqs[i]
+        frame[38] = seq >> 24
+        frame[39] = (seq >> 16) & 0xff
+        frame[40] = (seq >> 8) & 0xff
+        frame[41] = seq & 0xff
+
+        # IP header checksum
+        total = 0
+        for j in range(14, 34, 2):
+            total += (np.int64(frame[j]) << 8) | frame[j + 1]
+        total = (total & 0xffff) + (total >> 16)
+        total = ~((total & 0xffff) + (total >> 16)) & 0xffff
+        frame[24] = total >> 8
+        frame[25] = total & 0xff
+
+        # TCP checksum: pseudo-header (IPs, protocol, TCP length) + segment
+        total = 6 + ip_len - 20
+        for j in range(26, end - start - 1, 2):
+            total += (np.int64(frame[j]) << 8) | frame[j + 1]
+        if payload_len & 1:
+            total += np.int64(frame[end - start - 1]) << 8
+        total = (total & 0xffff) + (total >> 16)
+        total = ~((total & 0xffff) + (total >> 16)) & 0xffff
+        frame[50] = total >> 8
+        frame[51] = total & 0xff
+
+
+if njit is not None:
+    _fill_frames = njit(parallel=True, cache=True)(_fill_frames)
+
+
+def _json_body_section(body):
+    """JSON body with its Content-Type/Content-Length headers and the blank line"""
+    return b"Content-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+
+def write_pcap_records(f, packets):
+    """Append (timestamp, frame bytes) records to a PCAP file opened after PCAP_GLOBAL_HEADER"""
+    records = []
+    for ts, frame in packets:
+        sec = int(ts)
+        records.append(PCAP_RECORD.pack(sec, round((ts - sec) * 1e6), len(frame), len(frame)))
+        records.append(frame)
+    f.writelines(records)
+
+
+def concat_pcap_shards(output_file, shard_files):
+    """Join PCAPs written with PCAP_GLOBAL_HEADER: the header once, then each shard's records"""
+    with open(output_file, 'wb') as out:
+        out.write(PCAP_GLOBAL_HEADER)
+        for shard_file in shard_files:
+            with open(shard_file, 'rb') as shard:
+                shard.seek(len(PCAP_GLOBAL_HEADER))
+                shutil.copyfileobj(shard, out, 1 << 20)
+            os.remove(shard_file)
 
 
 class TrafficProfile:
@@ -70,6 +172,76 @@ class TrafficProfile:
         return cls.PROFILES.get(name, cls.PROFILES['medium'])
 
 
+class WeightedSampler:
+    """
+    O(1) sampling from a weighted list using Walker's alias method
+
+    Items use the same format as the pattern tables: (*item, weight).
+    The alias table is built once (Vose's construction), so each draw
+    costs one random number and two list lookups instead of a scan
+    over the cumulative weights.
+    """
+
+    def __init__(self, items):
+        self.values = tuple(item[0] if len(item) == 2 else tuple(item[:-1])
+                            for item in items)
+        n = len(items)
+        total_weight = sum(item[-1] for item in items)
+
+        # Scale weights so the mean is 1, then pair each under-full
+        # column with an over-full one
+        scaled = [item[-1] * n / total_weight for item in items]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are full columns (up to rounding error)
+
+        self.n = n
+        self.prob = tuple(prob)
+        self.alias = tuple(alias)
+        self._prob_array = np.array(prob)
+        self._alias_array = np.array(alias)
+
+    def sample(self, rng):
+        """Draw one item with a numpy Generator"""
+        u = rng.random() * self.n
+        i = int(u)
+        return self.values[i if u - i < self.prob[i] else self.alias[i]]
+
+    def sample_indices(self, rng, size):
+        """Draw size item indices at once with a numpy Generator"""
+        u = rng.random(size) * self.n
+        i = u.astype(np.intp)
+        return np.where(u - i < self._prob_array[i], i, self._alias_array[i])
+
+
+class TrafficStats:
+    """Generation counters (per-method/per-path counts are numpy arrays on the generator)"""
+
+    __slots__ = ('total_packets', 'total_bytes', 'sessions')
+
+    def __init__(self):
+        self.total_packets = 0
+        self.total_bytes = 0
+        self.sessions = 0
+
+    def merge(self, other):
+        """Add another TrafficStats (e.g. from a worker process) into this one"""
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self):
+        """Counters as a dict, in the order they are saved to the stats file"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
 class RealisticTrafficPatterns:
     """Defines realistic web application traffic patterns"""
 
@@ -120,33 +292,55 @@ class RealisticTrafficPatterns:
         ('Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 Chrome/120.0.6099.43 Mobile Safari/537.36', 0.05),
     ]
 
-    @classmethod
-    def select_weighted(cls, items):
-        """Select item from weighted list"""
-        total_weight = sum(weight for *_, weight in items)
-        rand_val = random.random() * total_weight
-        cumulative = 0.0
+    # Requests per user session (most users make 2-5 requests)
+    SESSION_SIZES = [
+        (1, 0.15), (2, 0.20), (3, 0.20), (4, 0.15), (5, 0.10),
+        (6, 0.08), (7, 0.05), (8, 0.04), (9, 0.02), (10, 0.01),
+    ]
 
-        for *item, weight in items:
-            cumulative += weight
-            if rand_val <= cumulative:
-                return item if len(item) > 1 else item[0]
+    SEARCH_QUERIES = ['laptop', 'phone', 'tablet', 'camera', 'headphones']
 
-        # Fallback
-        return items[0][:-1] if len(items[0]) > 1 else items[0][0]
+    # Methods counted in the statistics
+    HTTP_METHODS = ('GET', 'POST', 'PUT', 'DELETE', 'HEAD')
+
+    # Alias tables for the hot path, built once at import
+    PATH_SAMPLER = WeightedSampler([(p, m, b, w) for p, w, m, b in HTTP_PATHS])
+    USER_AGENT_SAMPLER = WeightedSampler(USER_AGENTS)
+    SESSION_SIZE_SAMPLER = WeightedSampler(SESSION_SIZES)
+
+    @classmethod
+    def select_weighted(cls, items, rng):
+        """Select item from weighted list (use the precomputed samplers when drawing repeatedly)"""
+        return WeightedSampler(items).sample(rng)
 
 
 class BaselineTrafficGenerator:
     """Generates realistic baseline HTTP traffic"""
 
-    def __init__(self, config):
+    def __init__(self, config, seed_sequence=None):
         self.config = config
+        # All random draws come from PCG64 Generators seeded from
+        # config['seed'] (None: fresh entropy): self.rng for the rate
+        # schedule, and one stream per simulated second (second_rng()) so
+        # the packets do not depend on how seconds are split across workers
+        if seed_sequence is None:
+            seed_sequence = np.random.SeedSequence(config.get('seed'))
+        self.seed_sequence = seed_sequence
+        self.rng = np.random.default_rng(self.seed_sequence)
         self.patterns = RealisticTrafficPatterns()
-        self.stats = defaultdict(int)
+        self.stats = TrafficStats()
+        # Per-method / per-path request counts, indexed like HTTP_METHODS and
+        # the path sampler (see counter_stats() for the string-keyed form)
+        self.method_counts = np.zeros(len(self.patterns.HTTP_METHODS), np.int64)
+        self.path_counts = np.zeros(len(self.patterns.PATH_SAMPLER.values), np.int64)
+        self._session_sizes = np.array(self.patterns.SESSION_SIZE_SAMPLER.values, np.int64)
+        self._path_method_indices = np.array([self.patterns.HTTP_METHODS.index(method)
+                                              for _, method, _ in self.patterns.PATH_SAMPLER.values])
         self.packets = []
 
         # Network configuration
         self.src_ip_base = config.get('src_ip_base', '192.168.')
+        self._src_ip_prefix = int.from_bytes(socket.inet_aton(f"{self.src_ip_base}0.0"), 'big')
         self.dst_ip = config.get('dst_ip', '10.0.0.1')
         self.src_mac = config.get('src_mac', 'aa:aa:aa:aa:aa:aa')
         self.dst_mac = config.get('dst_mac', 'bb:bb:bb:bb:bb:bb')
@@ -159,270 +353,541 @@ class BaselineTrafficGenerator:
         # Time-based variations
         self.enable_time_variations = config.get('enable_time_variations', True)
         self.simulation_start_hour = config.get('start_hour', 0)
+        # PCAP timestamps: capture_start + simulated second + offset in the second
+        self.capture_start = int(time.time())
+
+        # Ethernet + IPv4 + TCP header shared by every packet; the variable
+        # fields are zero and get patched per packet
+        self._frame_template = self._build_frame_template()
+        self._ip_checksum_base = sum16(self._frame_template[14:34])
+        # Fixed pseudo-header (destination IP + protocol) + TCP header
+        self._tcp_checksum_base = (sum16(self._frame_template[30:34]) + 6 +
+                                   sum16(self._frame_template[34:54]))
+        self._template_array = np.frombuffer(self._frame_template, np.uint8)
+
+        # Fixed request fragments, encoded once
+        self._request_lines = [f"{method} {path} HTTP/1.1\r\n".encode()
+                               for path, method, _ in self.patterns.PATH_SAMPLER.values]
+        self._host_line = f"Host: {self.dst_ip}\r\n".encode()
+        self._ua_lines = [f"User-Agent: {user_agent}\r\n".encode()
+                          for user_agent in self.patterns.USER_AGENT_SAMPLER.values]
+        self._common_headers = (b"Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
+                                b"Accept-Language: en-US,en;q=0.9\r\n"
+                                b"Accept-Encoding: gzip, deflate\r\n"
+                                b"Connection: keep-alive\r\n")
+        # One specialized request builder per path (see generate_http_request)
+        self._request_builders = [self._make_request_builder(path_idx)
+                                  for path_idx in range(len(self.patterns.PATH_SAMPLER.values))]
+
+    def _build_frame_template(self):
+        """
+        Build the 54-byte Ethernet + IPv4 + TCP header template
+
+        Same values Scapy uses by default (IP id 1, TTL 64, window 8192)
+        with PA flags; IP total length, source IP, source port, seq and
+        both checksums are left zero.
+        """
+        eth = (bytes.fromhex(self.dst_mac.replace(':', '')) +
+               bytes.fromhex(self.src_mac.replace(':', '')) + b'\x08\x00')
+        ip = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 0, 1, 0, 64, 6, 0,
+                         bytes(4), socket.inet_aton(self.dst_ip))
+        tcp = struct.pack('!HHIIBBHHH', 0, self.dst_port, 0, 0, 5 << 4, 0x18, 8192, 0, 0)
+        return eth + ip + tcp
+
+    def build_frame(self, src_ip, src_port, seq_num, payload):
+        """
+        Build a complete frame from the header template (checksums updated incrementally)
+
+        src_ip is the source address as a 32-bit integer.
+        """
+        src_hi, src_lo = src_ip >> 16, src_ip & 0xffff
+        ip_len = 40 + len(payload)
+
+        frame = bytearray(self._frame_template)
+        _IP_TOTAL_LENGTH.pack_into(frame, 16, ip_len)
+        _IP_SRC.pack_into(frame, 26, src_ip)
+        _TCP_SPORT.pack_into(frame, 34, src_port)
+        _TCP_SEQ.pack_into(frame, 38, seq_num)
+
+        _CHECKSUM.pack_into(frame, 24, fold16(self._ip_checksum_base + ip_len + src_hi + src_lo))
+        # TCP: pseudo-header (source IP + TCP length) + variable fields + payload
+        tcp_sum = (self._tcp_checksum_base + src_hi + src_lo + ip_len - 20 + src_port +
+                   (seq_num >> 16) + (seq_num & 0xffff) + sum16(payload))
+        _CHECKSUM.pack_into(frame, 50, fold16(tcp_sum))
+
+        frame += payload
+        return bytes(frame)
+
+    def build_frames(self, src_ips, src_ports, seqs, payloads):
+        """
+        Build a batch of frames (same bytes as build_frame() for each one)
+
+        With numba the batch is assembled by the compiled _fill_frames
+        kernel in a single buffer; without it, by _build_frames_numpy().
+        """
+        if njit is None:
+            return self._build_frames_numpy(src_ips, src_ports, seqs, payloads)
+
+        count = len(payloads)
+        payload_offsets = np.zeros(count + 1, np.int64)
+        np.cumsum(np.fromiter(map(len, payloads), np.int64, count), out=payload_offsets[1:])
+        frame_offsets = payload_offsets[:-1] + 54 * np.arange(count, dtype=np.int64)
+        out = np.empty(int(payload_offsets[-1]) + 54 * count, np.uint8)
+
+        _fill_frames(out, frame_offsets, self._template_array,
+                     np.frombuffer(b"".join(payloads), np.uint8), payload_offsets,
+                     np.array(src_ips, np.int64),
+                     np.array(src_ports, np.int64), np.array(seqs, np.int64))
+
+        data = out.tobytes()
+        bounds = frame_offsets.tolist()
+        bounds.append(len(data))
+        return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+    def _build_frames_numpy(self, src_ips, src_ports, seqs, payloads):
+        """
+        Build a batch of frames with numpy (fallback when numba is missing)
 
-    def generate_src_ip(self):
-        """Generate realistic source IP from pool"""
+        The headers of the whole batch are one (N, 54) array: the variable
+        fields are written column-wise and both checksums are word sums
+        over a big-endian uint16 view, folded for all frames at once. Only
+        the payload word sums and the final header + payload join are per
+        frame.
+        """
+        count = len(payloads)
+        ip_lens = 40 + np.fromiter(map(len, payloads), np.int64, count)
+
+        headers = np.tile(self._template_array, (count, 1))
+        headers[:, 16:18] = ip_lens.astype('>u2').view(np.uint8).reshape(count, 2)
+        headers[:, 26:30] = np.array(src_ips, '>u4').view(np.uint8).reshape(count, 4)
+        headers[:, 34:36] = np.array(src_ports, '>u2').view(np.uint8).reshape(count, 2)
+        headers[:, 38:42] = np.array(seqs, '>u4').view(np.uint8).reshape(count, 4)
+        words = headers.view('>u2')
+
+        # IP header (words 7-16), then pseudo-header IPs + TCP header (13-26)
+        ip_sums = words[:, 7:17].sum(axis=1, dtype=np.int64)
+        headers[:, 24:26] = fold16(ip_sums).astype('>u2').view(np.uint8).reshape(count, 2)
+        tcp_sums = (words[:, 13:27].sum(axis=1, dtype=np.int64) + 6 + ip_lens - 20 +
+                    np.fromiter(map(sum16, payloads), np.int64, count))
+        headers[:, 50:52] = fold16(tcp_sums).astype('>u2').view(np.uint8).reshape(count, 2)
+
+        data = headers.tobytes()
+        return [data[i:i + 54] + payload for i, payload in zip(range(0, len(data), 54), payloads)]
+
+    def generate_src_ips(self, octet3, octet4):
+        """Source IPs from the pool as 32-bit integers (octet3 0-255, octet4 1-254 arrays)"""
         # Use /16 network (65K IPs) for realistic client distribution
-        octet3 = random.randint(0, 255)
-        octet4 = random.randint(1, 254)
-        return f"{self.src_ip_base}{octet3}.{octet4}"
+        return self._src_ip_prefix | (octet3 << 8) | octet4
 
-    def calculate_rate_multiplier(self, elapsed_seconds):
+    def calculate_rate_schedule(self, duration_seconds):
         """
-        Calculate rate multiplier based on time of day
-        Simulates realistic daily traffic patterns:
+        Calculate the request rate for every simulated second at once
+
+        Rate multiplier based on time of day, simulating realistic daily
+        traffic patterns:
         - Low traffic at night (2am-6am): 0.3x
         - Rising in morning (6am-12pm): 0.5x -> 1.0x
         - Peak hours (12pm-6pm): 1.0x -> 1.2x
         - Evening (6pm-11pm): 0.8x -> 0.5x
         - Night (11pm-2am): 0.5x -> 0.3x
+
+        Returns an int64 array with the requests per second for seconds
+        0..duration_seconds-1 (base_rps times the multiplier).
         """
         if not self.enable_time_variations:
-            return 1.0
+            return np.full(duration_seconds, self.profile['base_rps'], np.int64)
 
         # Calculate simulated hour of day
-        hours_elapsed = elapsed_seconds / 3600.0
+        hours_elapsed = np.arange(duration_seconds) / 3600.0
         simulated_hour = (self.simulation_start_hour + hours_elapsed) % 24
 
         # Sinusoidal pattern with peaks at 2pm (14:00)
         # Low point at 4am (04:00)
-        hour_angle = ((simulated_hour - 4) / 24.0) * 2 * math.pi
-        base_variation = 0.6 + 0.4 * math.sin(hour_angle)
+        hour_angle = ((simulated_hour - 4) / 24.0) * 2 * np.pi
+        base_variation = 0.6 + 0.4 * np.sin(hour_angle)
 
         # Add weekday vs weekend variation (simplified)
-        day_variation = 1.0
-        if random.random() < 0.2:  # 20% chance of "weekend" behavior
-            day_variation = 0.7
+        # 20% chance of "weekend" behavior
+        day_variation = np.where(self.rng.random(duration_seconds) < 0.2, 0.7, 1.0)
 
         # Add random noise (±15%)
-        noise = 0.85 + 0.3 * random.random()
-
-        return base_variation * day_variation * noise
-
-    def generate_http_request(self):
-        """Generate realistic HTTP request"""
-        # Select path with weighted distribution
-        path, method, has_body = self.patterns.select_weighted(
-            [(p, m, b, w) for p, w, m, b in self.patterns.HTTP_PATHS]
-        )
-
-        # Select user agent
-        user_agent = self.patterns.select_weighted(self.patterns.USER_AGENTS)
-
-        # Build HTTP request
-        request = f"{method} {path} HTTP/1.1\r\n"
-        request += f"Host: {self.dst_ip}\r\n"
-        request += f"User-Agent: {user_agent}\r\n"
-        request += "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
-        request += "Accept-Language: en-US,en;q=0.9\r\n"
-        request += "Accept-Encoding: gzip, deflate\r\n"
-        request += "Connection: keep-alive\r\n"
-
-        # Add cookies for some requests (60% have cookies)
-        if random.random() < 0.6:
-            session_id = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=32))
-            request += f"Cookie: session_id={session_id}\r\n"
-
-        # Add body for POST requests
-        body = ""
-        if has_body and method in ['POST', 'PUT']:
-            if 'login' in path:
-                body = json.dumps({
-                    'email': f'user{random.randint(1000, 9999)}@example.com',
-                    'password': 'pass123'
-                })
-            elif 'search' in path:
-                queries = ['laptop', 'phone', 'tablet', 'camera', 'headphones']
-                body = json.dumps({'query': random.choice(queries)})
-            elif 'checkout' in path:
-                body = json.dumps({
-                    'cart_id': random.randint(1000, 9999),
-                    'payment_method': 'credit_card'
-                })
-            else:
-                body = json.dumps({'data': 'test'})
+        noise = 0.85 + 0.3 * self.rng.random(duration_seconds)
+
+        return (self.profile['base_rps'] * base_variation * day_variation * noise).astype(np.int64)
+
+    def generate_cookie_lines(self, rng, count):
+        """Generate count Cookie header lines with random 32-char session ids drawn from rng"""
+        lines = np.empty((count, _COOKIE_LINE_LEN), np.uint8)
+        lines[:, :len(_COOKIE_PREFIX)] = _COOKIE_PREFIX
+        lines[:, len(_COOKIE_PREFIX):-2] = _SESSION_ID_CHARS[
+            rng.integers(0, len(_SESSION_ID_CHARS), (count, 32))]
+        lines[:, -2:] = np.frombuffer(b"\r\n", np.uint8)
+
+        data = lines.tobytes()
+        return [data[i:i + _COOKIE_LINE_LEN] for i in range(0, len(data), _COOKIE_LINE_LEN)]
+
+    def _make_body_builder(self, path):
+        """
+        Return body(body_number, query_idx) -> JSON body section for a POST/PUT path
+
+        The section is the Content-Type/Content-Length headers, the blank
+        line and the body, formatted from byte templates (same text as
+        json.dumps); fully fixed sections are encoded once.
+        """
+        if 'login' in path:
+            template = b'{"email": "user%d@example.com", "password": "pass123"}'
+        elif 'search' in path:
+            sections = [_json_body_section(json.dumps({'query': query}).encode())
+                        for query in self.patterns.SEARCH_QUERIES]
+            return lambda body_number, query_idx: sections[query_idx]
+        elif 'checkout' in path:
+            template = b'{"cart_id": %d, "payment_method": "credit_card"}'
+        else:
+            section = _json_body_section(json.dumps({'data': 'test'}).encode())
+            return lambda body_number, query_idx: section
+
+        return lambda body_number, query_idx: _json_body_section(template % body_number)
+
+    def _make_request_builder(self, path_idx):
+        """
+        Specialize request building for one path
+
+        Returns build(ua_idx, cookie_line, body_number, query_idx) -> payload
+        bytes. Everything before the cookie (request line, Host, User-Agent
+        and common headers) is pre-joined per user agent, and the body kind
+        is chosen here instead of per request.
+        """
+        path, method, has_body = self.patterns.PATH_SAMPLER.values[path_idx]
+        prefix = self._request_lines[path_idx] + self._host_line
+        heads = [prefix + ua_line + self._common_headers for ua_line in self._ua_lines]
 
-            request += "Content-Type: application/json\r\n"
-            request += f"Content-Length: {len(body)}\r\n"
+        # Body only for POST/PUT requests
+        if not (has_body and method in ('POST', 'PUT')):
+            def build(ua_idx, cookie_line, body_number, query_idx):
+                return heads[ua_idx] + cookie_line + b"\r\n"
+            return build
 
-        request += "\r\n"
-        if body:
-            request += body
+        make_body = self._make_body_builder(path)
 
-        return request, method, path
+        def build(ua_idx, cookie_line, body_number, query_idx):
+            return heads[ua_idx] + cookie_line + make_body(body_number, query_idx)
+        return build
 
-    def create_http_packet(self, seq_num):
-        """Create a complete HTTP packet"""
-        src_ip = self.generate_src_ip()
-        src_port = random.randint(32768, 65535)
+    def generate_http_request(self, path_idx, ua_idx, cookie_line, body_number, query_idx):
+        """
+        Generate realistic HTTP request from pre-drawn random fields
 
-        # Generate HTTP request
-        http_request, method, path = self.generate_http_request()
+        path_idx/ua_idx index the path and user agent samplers, cookie_line
+        comes from generate_cookie_lines() (b"" for no cookie), body_number
+        (1000-9999) fills the login/checkout bodies and query_idx picks the
+        search query. Returns (payload bytes, method, path).
+        """
+        path, method, _ = self.patterns.PATH_SAMPLER.values[path_idx]
+        return self._request_builders[path_idx](ua_idx, cookie_line, body_number, query_idx), method, path
+
+    def create_http_packet(self, seq_num, src_ip, src_port, request):
+        """
+        Create an HTTP packet for a generate_http_request() result
+
+        Returns the packet as a (src_ip, src_port, seq, payload) spec; the
+        frames are built and timestamped in batches by generate_second(),
+        which also updates the method and path counts.
+        """
+        http_request, method, path = request
 
         # Create packet
-        pkt = Ether(src=self.src_mac, dst=self.dst_mac) / \
-              IP(src=src_ip, dst=self.dst_ip, ttl=64) / \
-              TCP(sport=src_port, dport=self.dst_port,
-                  flags='PA', seq=seq_num) / \
-              Raw(load=http_request.encode())
+        pkt = (src_ip, src_port, seq_num, http_request)
 
         # Update statistics
-        self.stats['total_packets'] += 1
-        self.stats[f'method_{method}'] += 1
-        self.stats[f'path_{path}'] = self.stats.get(f'path_{path}', 0) + 1
-        self.stats['total_bytes'] += len(pkt)
+        self.stats.total_packets += 1
+        self.stats.total_bytes += 54 + len(http_request)
 
         return pkt
 
-    def generate_session(self):
-        """Generate a realistic user session"""
-        src_ip = self.generate_src_ip()
-        src_port = random.randint(32768, 65535)
-
-        # Realistic session: 1-10 requests (most users make 2-5 requests)
-        num_requests = random.choices(
-            [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-            weights=[0.15, 0.20, 0.20, 0.15, 0.10, 0.08, 0.05, 0.04, 0.02, 0.01],
-            k=1
-        )[0]
+    def generate_session(self, src_ip, src_port, seq_num, requests):
+        """
+        Generate a realistic user session from one client (requests from generate_http_request())
 
+        Packets are specs in the same format as create_http_packet(); method
+        counts are updated per batch by generate_second().
+        """
         session_packets = []
-        seq_num = random.randint(1000000, 9999999)
+        session_bytes = 0
 
         # Generate requests in session
-        for _ in range(num_requests):
-            http_request, method, path = self.generate_http_request()
-
-            pkt = Ether(src=self.src_mac, dst=self.dst_mac) / \
-                  IP(src=src_ip, dst=self.dst_ip, ttl=64) / \
-                  TCP(sport=src_port, dport=self.dst_port,
-                      flags='PA', seq=seq_num) / \
-                  Raw(load=http_request.encode())
+        for http_request, method, path in requests:
+            pkt = (src_ip, src_port, seq_num, http_request)
 
             session_packets.append(pkt)
             seq_num += len(http_request)
+            session_bytes += 54 + len(http_request)
 
-            self.stats[f'method_{method}'] += 1
-
-        self.stats['total_packets'] += len(session_packets)
-        self.stats['sessions'] += 1
+        self.stats.total_packets += len(session_packets)
+        self.stats.total_bytes += session_bytes
+        self.stats.sessions += 1
 
         return session_packets
 
-    def generate_baseline_traffic(self, duration_seconds, output_file=None):
+    def second_rng(self, second):
+        """Generator for simulated second number second, derived from the SeedSequence"""
+        seed_sequence = self.seed_sequence
+        return np.random.default_rng(np.random.SeedSequence(
+            seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (second,)))
+
+    def generate_second(self, second, num_slots, seq_start):
+        """
+        Generate the packets for simulated second number second
+
+        Each of the num_slots slots is a single request (70%) or a session
+        of 1-10 requests (30%). All random fields are drawn up front as
+        numpy batches from second_rng(second), the packet specs are produced in one pass
+        and the frames are built together with build_frames(); single
+        packets use seq_start + their position as TCP seq. Returns
+        (timestamp, frame bytes) tuples, timestamped in packet order at
+        sorted random offsets within the second.
+        """
+        patterns = self.patterns
+        rng = self.second_rng(second)
+
+        single_mask = rng.random(num_slots) < 0.7
+        single = single_mask.tolist()
+        num_sessions = num_slots - sum(single)
+        session_sizes = self._session_sizes[
+            patterns.SESSION_SIZE_SAMPLER.sample_indices(rng, num_sessions)]
+        num_requests = num_slots - num_sessions + int(session_sizes.sum())
+        path_indices = patterns.PATH_SAMPLER.sample_indices(rng, num_requests)
+
+        # Method counts cover every request, path counts only single requests
+        requests_per_slot = np.ones(num_slots, np.int64)
+        requests_per_slot[~single_mask] = session_sizes
+        self.method_counts += np.bincount(self._path_method_indices[path_indices],
+                                          minlength=len(self.method_counts))
+        self.path_counts += np.bincount(path_indices[np.repeat(single_mask, requests_per_slot)],
+                                        minlength=len(self.path_counts))
+
+        # Per-slot fields: client address and port, session start seq
+        src_ips = self.generate_src_ips(rng.integers(0, 256, num_slots),
+                                        rng.integers(1, 255, num_slots)).tolist()
+        src_ports = rng.integers(32768, 65536, num_slots).tolist()
+        session_seqs = iter(rng.integers(1000000, 10000000, num_sessions).tolist())
+        session_sizes = iter(session_sizes.tolist())
+
+        # Per-request fields, consumed in slot order (60% carry a cookie)
+        has_cookie = (rng.random(num_requests) < 0.6).tolist()
+        cookie_lines = iter(self.generate_cookie_lines(rng, sum(has_cookie)))
+        requests = map(self.generate_http_request,
+                       path_indices.tolist(),
+                       patterns.USER_AGENT_SAMPLER.sample_indices(rng, num_requests).tolist(),
+                       [next(cookie_lines) if cookie else b"" for cookie in has_cookie],
+                       rng.integers(1000, 10000, num_requests).tolist(),
+                       rng.integers(0, len(patterns.SEARCH_QUERIES), num_requests).tolist())
+
+        packets = []
+        for is_single, src_ip, src_port in zip(single, src_ips, src_ports):
+            if is_single:
+                packets.append(self.create_http_packet(seq_start + len(packets), src_ip,
+                                                       src_port, next(requests)))
+            else:
+                packets.extend(self.generate_session(src_ip, src_port, next(session_seqs),
+                                                     islice(requests, next(session_sizes))))
+        if not packets:
+            return []
+
+        pkt_src_ips, pkt_src_ports, seqs, payloads = zip(*packets)
+        # Whole microseconds, so the PCAP records do not depend on float rounding
+        offsets = np.sort(rng.integers(0, 1000000, len(packets))) / 1e6
+        timestamps = (self.capture_start + second + offsets).tolist()
+        return list(zip(timestamps, self.build_frames(pkt_src_ips, pkt_src_ports, seqs, payloads)))
+
+    def generate_baseline_traffic(self, duration_seconds, output_file=None, workers=None):
         """
         Generate baseline traffic for specified duration
 
         Args:
             duration_seconds: How long to simulate traffic for
             output_file: Optional PCAP file to save traffic
+            workers: Generator processes when writing to a file (None: one per CPU)
+
+        The packets are written to output_file as they are generated and
+        only returned (and kept in self.packets) when no file is given.
+        With several workers each process generates a contiguous range of
+        seconds into its own PCAP and the shards are concatenated in order.
         """
         print(f"Generating baseline traffic for {duration_seconds} seconds...")
         print(f"Profile: {self.profile['description']}")
         print(f"Base rate: {self.profile['base_rps']} req/sec")
         print(f"Peak rate: {self.profile['peak_rps']} req/sec")
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         all_packets = []
+        rps_schedule = self.calculate_rate_schedule(duration_seconds).tolist()
+        workers = min(workers or os.cpu_count() or 1, duration_seconds) if output_file else 1
 
-        packets_generated = 0
-        elapsed = 0
-        last_progress_second = -1
+        if output_file:
+            print(f"Writing to {output_file} while generating")
+            if workers > 1:
+                print(f"Using {workers} generator processes")
 
         print("\nProgress:")
         print("=" * 80)
 
-        while elapsed < duration_seconds:
-            # Calculate current rate based on time of day
-            rate_multiplier = self.calculate_rate_multiplier(elapsed)
-            current_rps = int(self.profile['base_rps'] * rate_multiplier)
-
-            # Generate packets for this second
-            packets_this_second = current_rps
+        bytes_before = self.stats.total_bytes
+        if workers > 1:
+            packets_generated = self._generate_parallel(rps_schedule, output_file, workers, start_time)
+        else:
+            packets_generated = self._generate_serial(rps_schedule, output_file, all_packets, start_time)
+        total_size = self.stats.total_bytes - bytes_before
 
-            for _ in range(packets_this_second):
-                # 70% single packets, 30% as part of session
-                if random.random() < 0.7:
-                    pkt = self.create_http_packet(packets_generated)
-                    all_packets.append(pkt)
-                    packets_generated += 1
-                else:
-                    session_pkts = self.generate_session()
-                    all_packets.extend(session_pkts)
-                    packets_generated += len(session_pkts)
-
-            elapsed = time.time() - start_time
-            current_second = int(elapsed)
-
-            # Progress update every 10 seconds
-            if current_second != last_progress_second and current_second % 10 == 0 and current_second > 0:
-                last_progress_second = current_second
-                progress_pct = (current_second / duration_seconds) * 100
-                avg_rate = packets_generated / elapsed if elapsed > 0 else 0
-                eta_seconds = (duration_seconds - current_second)
-                eta_minutes = eta_seconds // 60
-                eta_secs = eta_seconds % 60
-
-                print(f"[{current_second:5d}/{duration_seconds}s] "
-                      f"Progress: {progress_pct:5.1f}% | "
-                      f"Packets: {packets_generated:,} | "
-                      f"Rate: {current_rps:,} rps | "
-                      f"Avg: {avg_rate:,.0f} pps | "
-                      f"ETA: {int(eta_minutes)}m {int(eta_secs)}s")
-                sys.stdout.flush()
-
-        total_time = time.time() - start_time
-        avg_rate = packets_generated / total_time
+        total_time = time.perf_counter() - start_time
+        avg_rate = packets_generated / total_time if total_time > 0 else 0
 
         print("=" * 80)
         print(f"\n✅ Generation Complete!")
         print(f"   Total packets: {packets_generated:,}")
         print(f"   Total time:    {total_time:.2f} seconds")
         print(f"   Average rate:  {avg_rate:,.0f} pps")
-        print(f"   Total size:    {sum(len(p) for p in all_packets):,} bytes ({sum(len(p) for p in all_packets)/1024/1024:.2f} MB)")
+        print(f"   Total size:    {total_size:,} bytes ({total_size/1024/1024:.2f} MB)")
 
-        # Save to PCAP if requested
         if output_file:
-            print(f"\n💾 Saving to {output_file}...")
-            wrpcap(output_file, all_packets)
-            print(f"   ✅ Saved {len(all_packets):,} packets successfully")
+            print(f"\n💾 Saved {packets_generated:,} packets to {output_file}")
 
         self.packets = all_packets
         return all_packets
 
+    def _generate_serial(self, rps_schedule, output_file, all_packets, start_time):
+        """
+        Generate every second in this process
+
+        Packets go to output_file, or to all_packets when there is no file.
+        Returns the number of packets generated.
+        """
+        duration_seconds = len(rps_schedule)
+        packets_generated = 0
+        slots_before = 0
+        progress_interval = max(1, duration_seconds // 20)
+
+        # Stream each second to the PCAP file; packets are only kept in
+        # memory when there is no output file
+        with open(output_file, 'wb') if output_file else nullcontext() as pcap_file:
+            if pcap_file is not None:
+                pcap_file.write(PCAP_GLOBAL_HEADER)
+
+            for second, current_rps in enumerate(rps_schedule):
+                # Generate packets for this second (rate based on time of day)
+                second_packets = self.generate_second(second, current_rps, slots_before)
+                slots_before += current_rps
+                packets_generated += len(second_packets)
+                if pcap_file is not None:
+                    write_pcap_records(pcap_file, second_packets)
+                else:
+                    all_packets.extend(second_packets)
+
+                # Progress update every 5% of the simulated duration
+                done_seconds = second + 1
+                if done_seconds % progress_interval == 0:
+                    elapsed = time.perf_counter() - start_time
+                    progress_pct = (done_seconds / duration_seconds) * 100
+                    avg_rate = packets_generated / elapsed if elapsed > 0 else 0
+                    eta_seconds = elapsed / done_seconds * (duration_seconds - done_seconds)
+                    eta_minutes = eta_seconds // 60
+                    eta_secs = eta_seconds % 60
+
+                    print(f"[{done_seconds:5d}/{duration_seconds}s] "
+                          f"Progress: {progress_pct:5.1f}% | "
+                          f"Packets: {packets_generated:,} | "
+                          f"Rate: {current_rps:,} rps | "
+                          f"Avg: {avg_rate:,.0f} pps | "
+                          f"ETA: {int(eta_minutes)}m {int(eta_secs)}s")
+                    sys.stdout.flush()
+
+        return packets_generated
+
+    def _generate_parallel(self, rps_schedule, output_file, workers, start_time):
+        """
+        Generate contiguous ranges of seconds in worker processes
+
+        Each shard gets this generator's SeedSequence, its first second and
+        capture_start, so it produces exactly the packets a serial run would
+        for those seconds, on the same timeline. Statistics from the
+        workers are merged into this generator. Returns the number of
+        packets generated.
+        """
+        duration_seconds = len(rps_schedule)
+        bounds = [duration_seconds * k // workers for k in range(workers + 1)]
+        shards = [(f"{output_file}.part{k}", self.seed_sequence, self.config, self.capture_start,
+                   bounds[k], rps_schedule[bounds[k]:bounds[k + 1]], sum(rps_schedule[:bounds[k]]))
+                  for k in range(workers)]
+
+        packets_generated = 0
+        shard_files = []
+        # spawn, not fork: forking after the numba parallel kernel has run in
+        # this process leaves its threading layer in a state that deadlocks
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            for k, result in enumerate(pool.imap(_generate_shard, shards)):
+                shard_file, packets, stats, method_counts, path_counts = result
+                shard_files.append(shard_file)
+                packets_generated += packets
+                self.stats.merge(stats)
+                self.method_counts += method_counts
+                self.path_counts += path_counts
+
+                done_seconds = bounds[k + 1]
+                elapsed = time.perf_counter() - start_time
+                print(f"[{done_seconds:5d}/{duration_seconds}s] "
+                      f"Progress: {done_seconds / duration_seconds * 100:5.1f}% | "
+                      f"Packets: {packets_generated:,} | "
+                      f"Avg: {packets_generated / elapsed:,.0f} pps")
+                sys.stdout.flush()
+
+        concat_pcap_shards(output_file, shard_files)
+        return packets_generated
+
+    def counter_stats(self):
+        """Non-zero method and path counts as 'method_<method>' / 'path_<path>' keys"""
+        counts = {}
+        for method, count in zip(self.patterns.HTTP_METHODS, self.method_counts.tolist()):
+            if count:
+                counts[f'method_{method}'] = count
+        for (path, _, _), count in zip(self.patterns.PATH_SAMPLER.values, self.path_counts.tolist()):
+            if count:
+                counts[f'path_{path}'] = count
+        return counts
+
     def print_stats(self):
         """Print traffic generation statistics"""
         print("\n=== Baseline Traffic Statistics ===")
         print(f"Profile:            {self.profile['description']}")
-        print(f"Total Sessions:     {self.stats['sessions']}")
-        print(f"Total Packets:      {self.stats['total_packets']}")
-        print(f"Total Bytes:        {self.stats['total_bytes']:,}")
-        print(f"Total MB:           {self.stats['total_bytes']/1024/1024:.2f}")
+        print(f"Total Sessions:     {self.stats.sessions}")
+        print(f"Total Packets:      {self.stats.total_packets}")
+        print(f"Total Bytes:        {self.stats.total_bytes:,}")
+        print(f"Total MB:           {self.stats.total_bytes/1024/1024:.2f}")
+
+        if self.stats.sessions > 0:
+            print(f"Avg Packets/Session:{self.stats.total_packets/self.stats.sessions:.2f}")
 
-        if self.stats['sessions'] > 0:
-            print(f"Avg Packets/Session:{self.stats['total_packets']/self.stats['sessions']:.2f}")
+        counts = self.counter_stats()
 
         print("\nHTTP Methods:")
-        methods = ['GET', 'POST', 'PUT', 'DELETE', 'HEAD']
-        for method in methods:
-            count = self.stats.get(f'method_{method}', 0)
+        for method in self.patterns.HTTP_METHODS:
+            count = counts.get(f'method_{method}', 0)
             if count > 0:
-                pct = (count / self.stats['total_packets']) * 100
+                pct = (count / self.stats.total_packets) * 100
                 print(f"  {method:8s}: {count:8d} ({pct:5.2f}%)")
 
         print("\nTop 10 Paths:")
-        path_counts = {k: v for k, v in self.stats.items() if k.startswith('path_')}
+        path_counts = {k: v for k, v in counts.items() if k.startswith('path_')}
         top_paths = sorted(path_counts.items(), key=lambda x: x[1], reverse=True)[:10]
         for path_key, count in top_paths:
             path = path_key.replace('path_', '')
-            pct = (count / self.stats['total_packets']) * 100
+            pct = (count / self.stats.total_packets) * 100
             print(f"  {path:40s}: {count:6d} ({pct:5.2f}%)")
 
         print("=" * 50)
 
     def save_stats(self, filename):
         """Save statistics to JSON file"""
-        stats_dict = dict(self.stats)
+        stats_dict = self.stats.as_dict()
+        stats_dict.update(self.counter_stats())
         stats_dict['timestamp'] = datetime.now().isoformat()
         stats_dict['config'] = self.config
         stats_dict['profile'] = self.profile
@@ -433,6 +898,28 @@ class BaselineTrafficGenerator:
         print(f"Statistics saved to {filename}")
 
 
+def _generate_shard(args):
+    """multiprocessing.Pool worker: writes a range of seconds to its own PCAP"""
+    shard_file, seed_sequence, config, capture_start, first_second, rps_schedule, seq_start = args
+    # One process per core already; keep the frame kernel single-threaded
+    if set_num_threads is not None:
+        set_num_threads(1)
+
+    generator = BaselineTrafficGenerator(config, seed_sequence)
+    generator.capture_start = capture_start
+    packets_generated = 0
+    with open(shard_file, 'wb') as f:
+        f.write(PCAP_GLOBAL_HEADER)
+        for second, current_rps in enumerate(rps_schedule, first_second):
+            second_packets = generator.generate_second(second, current_rps, seq_start)
+            seq_start += current_rps
+            packets_generated += len(second_packets)
+            write_pcap_records(f, second_packets)
+
+    return (shard_file, packets_generated, generator.stats,
+            generator.method_counts, generator.path_counts)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Realistic Baseline HTTP Traffic Dataset Generator'
@@ -459,6 +946,10 @@ def main():
                         help='Disable time-based rate variations')
     parser.add_argument('--stats-file', type=str, default=None,
                         help='Save statistics to JSON file')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed for reproducible datasets (default: random)')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='Generator processes (default: one per CPU)')
 
     args = parser.parse_args()
 
@@ -481,7 +972,8 @@ def main():
         'traffic_profile': args.profile,
         'enable_time_variations': not args.no_time_variations,
         'start_hour': args.start_hour,
-        'duration': args.duration
+        'duration': args.duration,
+        'seed': args.seed
     }
 
     print("=== Realistic Baseline Traffic Generator ===")
@@ -498,7 +990,7 @@ def main():
 
     # Generate traffic
     generator = BaselineTrafficGenerator(config)
-    generator.generate_baseline_traffic(args.duration, args.output)
+    generator.generate_baseline_traffic(args.duration, args.output, args.workers)
 
     # Print and save statistics
     generator.print_stats()
@@ -8,22 +8,63 @@ Output: PCAP files and flow statistics for analysis
 """
 
 import os
-import sys
 import time
 import random
 import argparse
 import json
+import socket
+import struct
 from datetime import datetime
 from collections import defaultdict
 
-try:
-    from scapy.all import *
-    from scapy.layers.inet import IP, TCP, UDP
-    from scapy.layers.http import HTTP, HTTPRequest
-    from scapy.layers.l2 import Ether
-except ImportError:
-    print("Error: Scapy not installed. Install with: pip install scapy")
-    sys.exit(1)
+from packet_utils import PCAP_GLOBAL_HEADER, PCAP_RECORD, sum16, fold16
+
+# TCP flag bits used by the generated sessions
+TCP_SYN = 0x02
+TCP_SYN_ACK = 0x12
+TCP_ACK = 0x10
+TCP_PSH_ACK = 0x18
+TCP_FIN_ACK = 0x11
+
+_IP_TOTAL_LENGTH = struct.Struct('!H')
+_IP_ADDRS = struct.Struct('!4s4s')
+_TCP_PORTS_SEQ_ACK = struct.Struct('!HHII')
+_CHECKSUM = struct.Struct('!H')
+
+
+def make_frame_template(src_mac, dst_mac):
+    """
+    Build a 54-byte Ethernet + IPv4 + TCP header template for one direction
+
+    Same values Scapy uses by default (IP id 1, TTL 64, window 8192);
+    addresses, ports, seq/ack, flags, lengths and checksums are filled
+    in per packet by build_frame().
+    """
+    eth = (bytes.fromhex(dst_mac.replace(':', '')) +
+           bytes.fromhex(src_mac.replace(':', '')) + b'\x08\x00')
+    ip = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 0, 1, 0, 64, 6, 0, bytes(4), bytes(4))
+    tcp = struct.pack('!HHIIBBHHH', 0, 0, 0, 0, 5 << 4, 0, 8192, 0, 0)
+    return eth + ip + tcp
+
+
+def build_frame(template, src_ip, dst_ip, src_port, dst_port, seq, ack, flags, payload=b""):
+    """Build a complete frame from a header template (IPs as packed 4-byte strings)"""
+    ip_len = 40 + len(payload)
+
+    frame = bytearray(template)
+    _IP_TOTAL_LENGTH.pack_into(frame, 16, ip_len)
+    _IP_ADDRS.pack_into(frame, 26, src_ip, dst_ip)
+    _TCP_PORTS_SEQ_ACK.pack_into(frame, 34, src_port, dst_port, seq, ack)
+    frame[47] = flags
+
+    _CHECKSUM.pack_into(frame, 24, fold16(sum16(frame[14:34])))
+    # TCP: pseudo-header (IPs, protocol, TCP length) + header + payload
+    tcp_sum = sum16(frame[26:34]) + 6 + ip_len - 20 + sum16(frame[34:54]) + sum16(payload)
+    _CHECKSUM.pack_into(frame, 50, fold16(tcp_sum))
+
+    frame += payload
+    return bytes(frame)
+
 
 # Traffic patterns for realistic benign traffic
 class BenignTrafficPatterns:
@@ -141,6 +182,11 @@ class BenignTrafficGenerator:
         self.dst_mac = config.get('dst_mac', 'bb:bb:bb:bb:bb:bb')
         self.dst_port = config.get('dst_port', 80)
 
+        # Header templates for client -> server and server -> client frames
+        self._client_template = make_frame_template(self.src_mac, self.dst_mac)
+        self._server_template = make_frame_template(self.dst_mac, self.src_mac)
+        self._dst_ip_packed = socket.inet_aton(self.dst_ip)
+
     def generate_src_ip(self):
         """Generate a source IP from the pool"""
         # Use a pool of /16 (65536 IPs) to simulate many clients
@@ -218,51 +264,53 @@ class BenignTrafficGenerator:
 
         return request, method
 
+    def client_frame(self, src_ip, src_port, seq, ack, flags, payload=b""):
+        """Frame from a client (packed src_ip) to the server"""
+        return build_frame(self._client_template, src_ip, self._dst_ip_packed,
+                           src_port, self.dst_port, seq, ack, flags, payload)
+
+    def server_frame(self, dst_ip, dst_port, seq, ack, flags):
+        """Frame from the server back to a client (packed dst_ip)"""
+        return build_frame(self._server_template, self._dst_ip_packed, dst_ip,
+                           self.dst_port, dst_port, seq, ack, flags)
+
     def create_http_packet(self, seq_num=None):
-        """Create a complete HTTP packet"""
+        """Create a complete HTTP packet as a (timestamp, frame bytes) tuple"""
         src_ip = self.generate_src_ip()
         src_port = self.generate_src_port()
 
         # Generate HTTP request
         http_request, method = self.generate_http_request()
+        payload = http_request.encode()
 
-        # Create packet layers
+        # Create packet
         if seq_num is None:
             seq_num = random.randint(1000000, 9999999)
 
-        pkt = Ether(src=self.src_mac, dst=self.dst_mac) / \
-              IP(src=src_ip, dst=self.dst_ip, ttl=64) / \
-              TCP(sport=src_port, dport=self.dst_port,
-                  flags='PA', seq=seq_num, ack=1) / \
-              Raw(load=http_request)
+        pkt = (time.time(), self.client_frame(socket.inet_aton(src_ip), src_port,
+                                              seq_num, 1, TCP_PSH_ACK, payload))
 
         # Update statistics
         self.stats['total_packets'] += 1
         self.stats[f'method_{method}'] += 1
-        self.stats['total_bytes'] += len(pkt)
+        self.stats['total_bytes'] += 54 + len(payload)
 
         return pkt
 
     def create_tcp_handshake(self, src_ip, src_port):
-        """Create TCP 3-way handshake packets (SYN, SYN-ACK, ACK)"""
+        """Create TCP 3-way handshake packets (SYN, SYN-ACK, ACK) for a packed src_ip"""
         packets = []
 
         # SYN
-        syn = Ether(src=self.src_mac, dst=self.dst_mac) / \
-              IP(src=src_ip, dst=self.dst_ip) / \
-              TCP(sport=src_port, dport=self.dst_port, flags='S', seq=1000)
+        syn = (time.time(), self.client_frame(src_ip, src_port, 1000, 0, TCP_SYN))
         packets.append(syn)
 
         # SYN-ACK (response from server)
-        synack = Ether(src=self.dst_mac, dst=self.src_mac) / \
-                 IP(src=self.dst_ip, dst=src_ip) / \
-                 TCP(sport=self.dst_port, dport=src_port, flags='SA', seq=2000, ack=1001)
+        synack = (time.time(), self.server_frame(src_ip, src_port, 2000, 1001, TCP_SYN_ACK))
         packets.append(synack)
 
         # ACK
-        ack = Ether(src=self.src_mac, dst=self.dst_mac) / \
-              IP(src=src_ip, dst=self.dst_ip) / \
-              TCP(sport=src_port, dport=self.dst_port, flags='A', seq=1001, ack=2001)
+        ack = (time.time(), self.client_frame(src_ip, src_port, 1001, 2001, TCP_ACK))
         packets.append(ack)
 
         self.stats['tcp_handshakes'] += 1
@@ -274,7 +322,7 @@ class BenignTrafficGenerator:
             # Realistic session: 1-20 requests per session
             num_requests = random.randint(1, 20)
 
-        src_ip = self.generate_src_ip()
+        src_ip = socket.inet_aton(self.generate_src_ip())
         src_port = self.generate_src_port()
 
         session_packets = []
@@ -287,32 +335,26 @@ class BenignTrafficGenerator:
         for _ in range(num_requests):
             # Create HTTP request
             http_request, method = self.generate_http_request()
+            payload = http_request.encode()
 
-            pkt = Ether(src=self.src_mac, dst=self.dst_mac) / \
-                  IP(src=src_ip, dst=self.dst_ip, ttl=64) / \
-                  TCP(sport=src_port, dport=self.dst_port,
-                      flags='PA', seq=seq_num) / \
-                  Raw(load=http_request)
+            pkt = (time.time(), self.client_frame(src_ip, src_port, seq_num, 0,
+                                                  TCP_PSH_ACK, payload))
 
             session_packets.append(pkt)
-            seq_num += len(http_request)
+            seq_num += len(payload)
 
             self.stats[f'method_{method}'] += 1
 
             # Simulate server response (ACK)
             # In real traffic, there would be response data, but we simplify here
-            ack_pkt = Ether(src=self.dst_mac, dst=self.src_mac) / \
-                      IP(src=self.dst_ip, dst=src_ip) / \
-                      TCP(sport=self.dst_port, dport=src_port, flags='A', ack=seq_num)
+            ack_pkt = (time.time(), self.server_frame(src_ip, src_port, 0, seq_num, TCP_ACK))
             session_packets.append(ack_pkt)
 
             # Delay between requests (think time)
             time_delay = random.uniform(0.001, 0.1)  # 1-100ms
 
         # TCP teardown (FIN)
-        fin = Ether(src=self.src_mac, dst=self.dst_mac) / \
-              IP(src=src_ip, dst=self.dst_ip) / \
-              TCP(sport=src_port, dport=self.dst_port, flags='FA', seq=seq_num)
+        fin = (time.time(), self.client_frame(src_ip, src_port, seq_num, 0, TCP_FIN_ACK))
         session_packets.append(fin)
 
         self.stats['total_packets'] += len(session_packets)
@@ -344,12 +386,32 @@ class BenignTrafficGenerator:
         # Save to PCAP if output file specified
         if output_file:
             print(f"Saving to {output_file}...")
-            wrpcap(output_file, all_packets)
+            self.write_pcap(output_file, all_packets)
             print(f"Saved {len(all_packets)} packets")
 
         self.packets = all_packets
         return all_packets
 
+    @staticmethod
+    def write_pcap(output_file, packets):
+        """Write (timestamp, frame bytes) packets to a PCAP file with a single write"""
+        buf = bytearray(len(PCAP_GLOBAL_HEADER) +
+                        sum(PCAP_RECORD.size + len(frame) for _, frame in packets))
+        buf[:len(PCAP_GLOBAL_HEADER)] = PCAP_GLOBAL_HEADER
+
+        pack_record = PCAP_RECORD.pack_into
+        off = len(PCAP_GLOBAL_HEADER)
+        for ts, frame in packets:
+            sec = int(ts)
+            caplen = len(frame)
+            pack_record(buf, off, sec, int((ts - sec) * 1e6), caplen, caplen)
+            off += PCAP_RECORD.size
+            buf[off:off + caplen] = frame
+            off += caplen
+
+        with open(output_file, 'wb') as f:
+            f.write(buf)
+
     def print_stats(self):
         """Print traffic generation statistics"""
         print("\n=== Benign Traffic Statistics ===")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Packet helpers shared by the benign traffic generators
+
+Ones' complement checksum arithmetic for building IPv4/TCP headers by
+hand, and the PCAP file format constants used to write the frames.
+"""
+
+import struct
+
+# PCAP global header: microsecond timestamps, v2.4, snaplen 65535, Ethernet
+PCAP_GLOBAL_HEADER = struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)
+# Per-record header: ts_sec, ts_usec, captured length, original length
+PCAP_RECORD = struct.Struct('<IIII')
+
+
+def sum16(data):
+    """
+    Sum of the 16-bit big-endian words of data, modulo 0xFFFF
+
+    Since 2**16 == 1 (mod 0xFFFF), data read as one big integer is
+    congruent to the sum of its words, and any congruent value folds to
+    the same ones' complement checksum.
+    """
+    return (int.from_bytes(data, 'big') << (8 * (len(data) & 1))) % 0xFFFF
+
+
+def fold16(total):
+    """Fold a word sum to 16 bits and complement it (final checksum; also works on numpy arrays)"""
+    total = (total & 0xffff) + (total >> 16)
+    total = (total & 0xffff) + (total >> 16)
+    return ~total & 0xffff